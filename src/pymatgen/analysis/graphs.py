@@ -1724,10 +1724,7 @@ class MoleculeGraph(MSONable):
         else:
             structure = None
 
-        for idx in range(len(molecule)):
-            neighbors = (
-                strategy.get_nn_info(molecule, idx) if structure is None else strategy.get_nn_info(structure, idx)
-            )
+        for idx, neighbors in enumerate(strategy.get_all_nn_info(molecule if structure is None else structure)):
             for neighbor in neighbors:
                 # all bonds in molecules should not cross
                 # (artificial) periodic boundaries
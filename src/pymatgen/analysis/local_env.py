@@ -10,21 +10,25 @@ import json
 import math
 import os
 import warnings
-from bisect import bisect_left
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
 from copy import deepcopy
-from functools import lru_cache
+from functools import cache
+from itertools import combinations, compress
 from typing import TYPE_CHECKING, Literal, NamedTuple, get_args
 
 import numpy as np
+from joblib import Parallel, delayed
 from monty.dev import deprecated, requires
 from monty.serialization import loadfn
 from pymatgen.analysis.bond_valence import BV_PARAMS, BVAnalyzer
 from pymatgen.analysis.graphs import MoleculeGraph, StructureGraph
 from pymatgen.analysis.molecule_structure_comparator import CovalentRadius
 from pymatgen.core import Element, IStructure, PeriodicNeighbor, PeriodicSite, Site, Species, Structure
+from pymatgen.util.coord import pbc_diff
+from pymatgen.util.numba import njit
 from ruamel.yaml import YAML
-from scipy.spatial import Voronoi
+from scipy.spatial import QhullError, Voronoi
 
 try:
     from openbabel import openbabel
@@ -49,16 +53,70 @@ __status__ = "Production"
 __date__ = "August 17, 2017"
 
 module_dir = os.path.dirname(os.path.abspath(__file__))
-yaml = YAML()
 
-with open(f"{module_dir}/op_params.yaml") as file:
-    default_op_params = yaml.load(file)
 
-with open(f"{module_dir}/cn_opt_params.yaml") as file:
-    cn_opt_params = yaml.load(file)
+@cache
+def _load_op_params() -> dict:
+    """Load the default order parameter settings from op_params.yaml on first use."""
+    with open(f"{module_dir}/op_params.yaml") as file:
+        return YAML(typ="safe").load(file)
 
-with open(f"{module_dir}/ionic_radii.json") as file:
-    _ion_radii = json.load(file)
+
+@cache
+def _load_cn_opt_params() -> dict:
+    """Load the CN-specific order parameter settings from cn_opt_params.yaml on first use."""
+    with open(f"{module_dir}/cn_opt_params.yaml") as file:
+        return YAML(typ="safe").load(file)
+
+
+@cache
+def _load_ion_radii() -> dict:
+    """Load the ionic radii table from ionic_radii.json on first use."""
+    with open(f"{module_dir}/ionic_radii.json") as file:
+        return json.load(file)
+
+
+@cache
+def _load_jmol_radii() -> dict[str, float]:
+    """Load the elemental radii table used by JmolNN from bonds_jmol_ob.yaml on first use."""
+    with open(f"{module_dir}/bonds_jmol_ob.yaml") as file:
+        return YAML(typ="safe").load(file)
+
+
+@cache
+def _get_cn_opt_params_cns() -> frozenset[int]:
+    """Get the coordination numbers for which motif order parameters are defined."""
+    return frozenset(int(k_cn) for k_cn in _load_cn_opt_params())
+
+
+@cache
+def _get_cn_order_params(cn: int) -> tuple[list[str], LocalStructOrderParams]:
+    """Get the motif names and the matching LocalStructOrderParams for a coordination number.
+
+    Args:
+        cn (int): coordination number, must be one of _get_cn_opt_params_cns().
+
+    Returns:
+        tuple[list[str], LocalStructOrderParams]: motif names and the order
+            parameter calculator, whose results are in the same order as the names.
+    """
+    cn_params = _load_cn_opt_params()[cn]
+    names = list(cn_params)
+    types = []
+    params = []
+    for name in names:
+        types.append(cn_params[name][0])
+        params.append(cn_params[name][1] if len(cn_params[name]) > 1 else None)
+    return names, LocalStructOrderParams(types, parameters=params)
+
+
+def __getattr__(name: str) -> Any:
+    """Lazily load the static data tables, which many users of this module never need."""
+    if name == "default_op_params":
+        return _load_op_params()
+    if name == "cn_opt_params":
+        return _load_cn_opt_params()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class ValenceIonicRadiusEvaluator:
@@ -99,6 +157,7 @@ class ValenceIonicRadiusEvaluator:
         """
         radii = []
         vnn = VoronoiNN()
+        ion_radii = _load_ion_radii()
 
         def nearest_key(sorted_vals: list[int], skey: int) -> int:
             idx = bisect_left(sorted_vals, skey)
@@ -126,18 +185,19 @@ class ValenceIonicRadiusEvaluator:
 
             el = site.specie.symbol
             oxi_state = int(round(site.specie.oxi_state))
-            coord_no = int(round(vnn.get_cn(self._structure, idx)))
+            raw_coord_no = vnn.get_cn(self._structure, idx)
+            coord_no = int(round(raw_coord_no))
             try:
-                tab_oxi_states = sorted(map(int, _ion_radii[el]))
+                tab_oxi_states = sorted(map(int, ion_radii[el]))
                 oxi_state = nearest_key(tab_oxi_states, oxi_state)
-                radius = _ion_radii[el][str(oxi_state)][str(coord_no)]
+                radius = ion_radii[el][str(oxi_state)][str(coord_no)]
             except KeyError:
-                new_coord_no = coord_no + (1 if vnn.get_cn(self._structure, idx) - coord_no > 0 else -1)
+                new_coord_no = coord_no + (1 if raw_coord_no - coord_no > 0 else -1)
                 try:
-                    radius = _ion_radii[el][str(oxi_state)][str(new_coord_no)]
+                    radius = ion_radii[el][str(oxi_state)][str(new_coord_no)]
                     coord_no = new_coord_no
                 except Exception:
-                    tab_coords = sorted(map(int, _ion_radii[el][str(oxi_state)]))
+                    tab_coords = sorted(map(int, ion_radii[el][str(oxi_state)]))
                     new_coord_no = nearest_key(tab_coords, coord_no)
                     idx = 0
                     for val in tab_coords:
@@ -146,15 +206,15 @@ class ValenceIonicRadiusEvaluator:
                         idx += 1
                     if idx == len(tab_coords):
                         key = str(tab_coords[-1])
-                        radius = _ion_radii[el][str(oxi_state)][key]
+                        radius = ion_radii[el][str(oxi_state)][key]
                     elif idx == 0:
                         key = str(tab_coords[0])
-                        radius = _ion_radii[el][str(oxi_state)][key]
+                        radius = ion_radii[el][str(oxi_state)][key]
                     else:
                         key = str(tab_coords[idx - 1])
-                        radius1 = _ion_radii[el][str(oxi_state)][key]
+                        radius1 = ion_radii[el][str(oxi_state)][key]
                         key = str(tab_coords[idx])
-                        radius2 = _ion_radii[el][str(oxi_state)][key]
+                        radius2 = ion_radii[el][str(oxi_state)][key]
                         radius = (radius1 + radius2) / 2
 
             # implement complex checks later
@@ -236,6 +296,18 @@ def _handle_disorder(structure: Structure, on_disorder: on_disorder_options):
     return structure
 
 
+class _NNStep(NamedTuple):
+    """A single hop through the neighbor network, used when computing neighbor shells.
+
+    This is a compact stand-in for the dicts returned by `NearNeighbors.get_nn_info`,
+    which have to stay dicts as subclasses attach extra keys to them.
+    """
+
+    site_index: int
+    image: Tuple3Ints
+    weight: float
+
+
 class NearNeighbors:
     """
     Base class to determine near neighbors that typically include nearest
@@ -323,19 +395,20 @@ class NearNeighbors:
         """
         siw = self.get_nn_info(structure, n)
 
-        cn_dict = {}
+        # Neighbors are mostly periodic images of a handful of sites, so only
+        # format the species string once per site index
+        species_strings: dict[int, str] = {}
+        cn_dict: dict[str, float] = defaultdict(float if use_weights else int)
         for idx in siw:
-            site_element = idx["site"].species_string
-            if site_element not in cn_dict:
-                if use_weights:
-                    cn_dict[site_element] = idx["weight"]
-                else:
-                    cn_dict[site_element] = 1
-            elif use_weights:
-                cn_dict[site_element] += idx["weight"]
+            site_index = idx.get("site_index")
+            if site_index is None:
+                site_element = idx["site"].species_string
             else:
-                cn_dict[site_element] += 1
-        return cn_dict
+                site_element = species_strings.get(site_index)
+                if site_element is None:
+                    site_element = species_strings[site_index] = idx["site"].species_string
+            cn_dict[site_element] += idx["weight"] if use_weights else 1
+        return dict(cn_dict)
 
     def get_nn(self, structure: Structure, n: int):
         """Get near neighbors of site with index n in structure.
@@ -393,7 +466,9 @@ class NearNeighbors:
                 corresponding Site object, 'image' gives the image location, and
                 'weight' provides the weight that a given near-neighbor site contributes
                 to the coordination number (1 or smaller), 'site_index' gives index of
-                the corresponding site in the original structure.
+                the corresponding site in the original structure. Subclasses may add
+                extra keys (e.g. 'poly_info' or 'edge_properties') or adjust the weights
+                of these dictionaries in place.
         """
         raise NotImplementedError("get_nn_info(structure, n) is not defined!")
 
@@ -440,17 +515,21 @@ class NearNeighbors:
         sites = self._get_nn_shell_info(structure, all_nn_info, site_idx, shell)
 
         # Now update the site positions. Did not do this during NN options because that can be slower.
-        output = []
-        for info in sites:
-            orig_site = structure[info["site_index"]]
+        # All fractional coordinates are shifted in one go, and as the species come from
+        # already validated sites, the per-site checks of PeriodicSite can be skipped
+        if not sites:
+            return sites
+        orig_sites = [structure[info["site_index"]] for info in sites]
+        frac_coords = np.array([site.frac_coords for site in orig_sites]) + np.array([info["image"] for info in sites])
+        for info, orig_site, coords in zip(sites, orig_sites, frac_coords):
             info["site"] = PeriodicSite(
                 orig_site.species,
-                np.add(orig_site.frac_coords, info["image"]),
+                coords,
                 structure.lattice,
                 properties=orig_site.properties,
+                skip_checks=True,
             )
-            output.append(info)
-        return output
+        return sites
 
     def _get_nn_shell_info(
         self,
@@ -463,13 +542,18 @@ class NearNeighbors:
     ):
         """Private method for computing the neighbor shell information.
 
+        The paths never visit a site twice, not only never step straight back, so
+        the shells are not given by the non-backtracking walk recurrence on the
+        weighted adjacency matrix. Partial paths are merged by their last site and
+        visited sites instead, and the cost still grows quickly with the shell.
+
         Args:
             structure (Structure) - Structure being assessed
             all_nn_info ([[dict]]) - Results from `get_all_nn_info`
             site_idx (int) - index of site for which to determine neighbor
                 information.
             shell (int) - Which neighbor shell to retrieve (1 == 1st NN shell)
-            _previous_steps ({(site_idx, image}) - Internal use only: Set of
+            _previous_steps ({(site_idx, image)}) - Internal use only: Set of
                 sites that have already been traversed.
             _cur_image (tuple) - Internal use only Image coordinates of current atom
 
@@ -481,62 +565,51 @@ class NearNeighbors:
         if shell <= 0:
             raise ValueError("Shell must be positive")
 
-        # Append this site to the list of previously-visited sites
-        _previous_steps = _previous_steps | {(site_idx, _cur_image)}
-
-        # Get all the neighbors of this site
-        possible_steps = list(all_nn_info[site_idx])
-        for idx, step in enumerate(possible_steps):
-            # Update the image information
-            # Note: We do not update the site position yet, as making a PeriodicSite
-            # for each intermediate step is too costly
-            step = dict(step)
-            step["image"] = tuple(np.add(step["image"], _cur_image).tolist())
-            possible_steps[idx] = step
-
-        # Get only the non-backtracking steps
-        allowed_steps = [x for x in possible_steps if (x["site_index"], x["image"]) not in _previous_steps]
-
-        # If we are the last step (i.e., shell == 1), done!
-        if shell == 1:
-            # No further work needed, just package these results
-            return allowed_steps
-
-        # If not, Get the N-1 NNs of these allowed steps
-        terminal_neighbors = [
-            self._get_nn_shell_info(
-                structure,
-                all_nn_info,
-                x["site_index"],
-                shell - 1,
-                _previous_steps,
-                x["image"],
-            )
-            for x in allowed_steps
+        # Pack the neighbor info into light-weight tuples once, rather than
+        # copying the neighbor dicts at every hop of every path
+        all_steps = [
+            [_NNStep(info["site_index"], tuple(int(i) for i in info["image"]), info["weight"]) for info in nn_info]
+            for nn_info in all_nn_info
         ]
 
-        # Each allowed step results in many terminal neighbors
-        #  And, different first steps might results in the same neighbor
-        #  Now, we condense those neighbors into a single entry per neighbor
-        all_sites = {}
-        for first_site, term_sites in zip(allowed_steps, terminal_neighbors):
-            for term_site in term_sites:
-                key = (term_site["site_index"], tuple(term_site["image"]))
-
-                # The weight for this site is equal to the weight of the
-                #  first step multiplied by the weight of the terminal neighbor
-                term_site["weight"] *= first_site["weight"]
-
-                # Check if this site is already known
-                value = all_sites.get(key)
-                if value is not None:
-                    # If so, add to its weight
-                    value["weight"] += term_site["weight"]
-                else:
-                    # If not, prepare to add it
-                    value = term_site
-                all_sites[key] = value
-        return list(all_sites.values())
+        # Walk the neighbor network one hop at a time. Partial paths that end on the
+        # same site and have visited the same set of sites have identical continuations,
+        # so they are merged (summing their weights) instead of being expanded separately
+        start = (site_idx, tuple(_cur_image))
+        paths = {(start, _previous_steps | {start}): 1.0}
+        for _ in range(shell - 1):
+            next_paths: dict = {}
+            for ((idx, (a, b, c)), visited), path_weight in paths.items():
+                for step in all_steps[idx]:
+                    # Note: We do not update the site position yet, as making a PeriodicSite
+                    # for each intermediate step is too costly
+                    image = step.image
+                    key = (step.site_index, (image[0] + a, image[1] + b, image[2] + c))
+
+                    # Only follow the non-backtracking steps
+                    if key not in visited:
+                        state = (key, visited | {key})
+                        next_paths[state] = next_paths.get(state, 0) + path_weight * step.weight
+            paths = next_paths
+
+        # Take the last step. Different paths might result in the same neighbor,
+        # so we condense those into a single entry per neighbor
+        weights: dict = {}
+        sources: dict = {}
+        for ((idx, (a, b, c)), visited), path_weight in paths.items():
+            for step, info in zip(all_steps[idx], all_nn_info[idx]):
+                image = step.image
+                key = (step.site_index, (image[0] + a, image[1] + b, image[2] + c))
+                if key in visited:
+                    continue
+
+                # The weight for this site is the product of the weights along the path
+                if key not in weights:
+                    weights[key] = 0
+                    sources[key] = info
+                weights[key] += path_weight * step.weight
+
+        return [{**sources[key], "image": key[1], "weight": weight} for key, weight in weights.items()]
 
     @staticmethod
     def _get_image(structure: Structure, site: Site) -> Tuple3Ints:
@@ -558,8 +631,10 @@ class NearNeighbors:
             return site.image
 
         original_site = structure[NearNeighbors._get_original_site(structure, site)]
-        image = np.around(np.subtract(site.frac_coords, original_site.frac_coords))
-        return tuple(image.astype(int))
+        # Plain Python rounding (half to even, like np.around) avoids array
+        # allocations in this frequently called method
+        fa, fb = site.frac_coords, original_site.frac_coords
+        return round(fa[0] - fb[0]), round(fa[1] - fb[1]), round(fa[2] - fb[2])
 
     @staticmethod
     def _get_original_site(structure: Structure, site: Site) -> int:
@@ -569,12 +644,17 @@ class NearNeighbors:
         if isinstance(site, PeriodicNeighbor):
             return site.index
 
-        for idx, struc_site in enumerate(structure):
-            if isinstance(structure, (IStructure, Structure)):
-                if site.is_periodic_image(struc_site):
+        if isinstance(structure, (IStructure, Structure)):
+            # Find the sites at the same periodic position for all sites at once,
+            # then only run the full periodic image check on those candidates
+            frac_diff = pbc_diff(site.frac_coords, structure.frac_coords, site.lattice.pbc)
+            for idx in np.flatnonzero(np.all(np.abs(frac_diff) <= 1e-8, axis=1)).tolist():
+                if site.is_periodic_image(structure[idx]):
+                    return idx
+        else:
+            for idx, struc_site in enumerate(structure):
+                if site == struc_site:
                     return idx
-            elif site == struc_site:
-                return idx
         raise ValueError("Site not found in structure")
 
     def get_bonded_structure(
@@ -584,6 +664,8 @@ class NearNeighbors:
         weights: bool = True,
         edge_properties: bool = False,
         on_disorder: on_disorder_options = "take_majority_strict",
+        *,
+        n_jobs: int = 1,
     ) -> StructureGraph | MoleculeGraph:
         """
         Obtain a StructureGraph object using this NearNeighbor class. Requires pip install networkx.
@@ -601,6 +683,8 @@ class NearNeighbors:
                 on each site. For {{Fe: 0.4, O: 0.4, C: 0.2}}, 'error' and 'take_majority_strict'
                 will raise ValueError, while 'take_majority_drop' ignores this site altogether and
                 'take_max_species' will use Fe as the site specie.
+            n_jobs (int): Number of parallel jobs used to compute the order parameters
+                if decorate is True. Defaults to 1, i.e. no parallelization.
 
         Returns:
             StructureGraph: object from pymatgen.analysis.graphs
@@ -612,7 +696,7 @@ class NearNeighbors:
             # with site properties that provides information on the
             # coordination number and coordination pattern based
             # on the (current) structure of this graph.
-            order_parameters = [self.get_local_order_parameters(structure, n) for n in range(len(structure))]
+            order_parameters = self._get_all_local_order_parameters(structure, n_jobs=n_jobs)
             structure.add_site_property("order_parameters", order_parameters)
 
         struct_graph = StructureGraph.from_local_env_strategy(
@@ -641,18 +725,13 @@ class NearNeighbors:
         """
         # code from @nisse3000, moved here from graphs to avoid circular
         # import, also makes sense to have this as a general NN method
-        cn = self.get_cn(structure, n)
-        int_cn = [int(k_cn) for k_cn in cn_opt_params]
-        if cn in int_cn:
-            names = list(cn_opt_params[cn])
-            types = []
-            params = []
-            for name in names:
-                types.append(cn_opt_params[cn][name][0])
-                tmp = cn_opt_params[cn][name][1] if len(cn_opt_params[cn][name]) > 1 else None
-                params.append(tmp)
-            lsops = LocalStructOrderParams(types, parameters=params)
-            sites = [structure[n], *self.get_nn(structure, n)]
+        # Same disorder handling as get_cn, but only search for neighbors once
+        structure = _handle_disorder(structure, "take_majority_strict")
+        nn_info = self.get_nn_info(structure, n)
+        cn = len(nn_info)
+        if cn in _get_cn_opt_params_cns():
+            names, lsops = _get_cn_order_params(cn)
+            sites = [structure[n], *(entry["site"] for entry in nn_info)]
             lostop_vals = lsops.get_order_parameters(sites, 0, indices_neighs=list(range(1, cn + 1)))  # type: ignore[call-overload, arg-type]
             dct = {}
             for idx, lsop in enumerate(lostop_vals):
@@ -660,6 +739,26 @@ class NearNeighbors:
             return dct
         return None
 
+    def _get_all_local_order_parameters(
+        self, structure: Structure, *, n_jobs: int = 1
+    ) -> list[dict[str, float] | None]:
+        """Calculate the local structure order parameters of all sites in a structure.
+
+        Args:
+            structure: Structure object
+            n_jobs (int): Number of parallel jobs. Defaults to 1, i.e. no
+                parallelization.
+
+        Returns:
+            list[dict[str, float] | None]: Output of `get_local_order_parameters`
+                for each site in the structure.
+        """
+        if n_jobs == 1:
+            return [self.get_local_order_parameters(structure, n) for n in range(len(structure))]
+        return Parallel(n_jobs=n_jobs)(
+            delayed(self.get_local_order_parameters)(structure, n) for n in range(len(structure))
+        )
+
 
 class VoronoiNN(NearNeighbors):
     """
@@ -676,6 +775,7 @@ class VoronoiNN(NearNeighbors):
         weight="solid_angle",
         extra_nn_info=True,
         compute_adj_neighbors=True,
+        prune_tessellation=False,
     ):
         """
         Args:
@@ -692,6 +792,11 @@ class VoronoiNN(NearNeighbors):
             extra_nn_info (bool) - Add all polyhedron info to `get_nn_info`
             compute_adj_neighbors (bool) - Whether to compute which neighbors are
                 adjacent. Turn off for faster performance.
+            prune_tessellation (bool) - Whether to tessellate only the sites close
+                enough to share a face with the cell of the site in question (adding
+                more sites as needed) in get_voronoi_polyhedra. Gives the same cell
+                faster for large cutoffs, but the neighbors may be listed in a
+                different order.
         """
         super().__init__()
         self.tol = tol
@@ -701,6 +806,7 @@ class VoronoiNN(NearNeighbors):
         self.weight = weight
         self.extra_nn_info = extra_nn_info
         self.compute_adj_neighbors = compute_adj_neighbors
+        self.prune_tessellation = prune_tessellation
 
     @property
     def structures_allowed(self) -> bool:
@@ -751,13 +857,37 @@ class VoronoiNN(NearNeighbors):
 
         while True:
             try:
-                neighbors = structure.get_sites_in_sphere(center.coords, self.cutoff)
-                neighbors = [ngbr[0] for ngbr in sorted(neighbors, key=lambda s: s[1])]
+                # Get the points in the sphere as arrays, sorted by distance from the center
+                frac_coords, dists, indices, images = structure.lattice.get_points_in_sphere(
+                    structure.frac_coords, center.coords, self.cutoff, zip_results=False
+                )
+                order = np.argsort(dists, kind="stable")
+                frac_coords, dists, indices, images = frac_coords[order], dists[order], indices[order], images[order]
 
                 # Run the Voronoi tessellation
-                qvoronoi_input = [site.coords for site in neighbors]
+                qvoronoi_input = structure.lattice.get_cartesian_coords(frac_coords)
 
-                voro = Voronoi(qvoronoi_input)  # can give seg fault if cutoff is too small
+                # can give seg fault if cutoff is too small
+                if self.prune_tessellation:
+                    voro = self._get_center_voronoi(qvoronoi_input, dists.tolist())
+                else:
+                    voro = Voronoi(qvoronoi_input)
+
+                # Only make sites for the points that share a face with the center
+                ridge_points = voro.ridge_points
+                neighbors = {
+                    idx: PeriodicNeighbor(
+                        structure[indices[idx]].species,
+                        frac_coords[idx],
+                        structure.lattice,
+                        properties=structure[indices[idx]].properties,
+                        nn_distance=dists[idx],
+                        image=images[idx],
+                        index=indices[idx],
+                        label=structure[indices[idx]].label,
+                    )
+                    for idx in np.unique(ridge_points[(ridge_points == 0).any(axis=1)]).tolist()
+                }
 
                 # Extract data about the site in question
                 cell_info = self._extract_cell_info(0, neighbors, targets, voro, self.compute_adj_neighbors)
@@ -772,6 +902,41 @@ class VoronoiNN(NearNeighbors):
                 self.cutoff = min(self.cutoff * 2, max_cutoff + 0.001)
         return cell_info
 
+    @staticmethod
+    def _get_center_voronoi(points: np.ndarray, dists: list[float]) -> Voronoi:
+        """Get a Voronoi tessellation that contains the exact cell of the first point.
+
+        Points further from the first point than twice the distance to the furthest
+        vertex of its cell cannot share a face with it. So the tessellation is run on
+        the points closest to the first point, and only extended to more points when
+        the cell is unbounded or reaches past that bound.
+
+        Args:
+            points (np.ndarray): Nx3 Cartesian coordinates, sorted by distance
+                from the first point.
+            dists ([float]): distance of each point from the first point.
+
+        Returns:
+            Voronoi: tessellation of the points closest to the first point.
+        """
+        radius = 3 * dists[1] if len(dists) > 1 else 0
+        while 0 < radius < dists[-1]:
+            try:
+                voro = Voronoi(points[: bisect_right(dists, radius)])
+            except QhullError:
+                # e.g. all points close to the first point are coplanar
+                radius *= 2
+                continue
+
+            region = voro.regions[voro.point_region[0]]
+            if region and -1 not in region:
+                cell_radius = np.linalg.norm(voro.vertices[region] - points[0], axis=1).max()
+                if 2 * cell_radius < radius:
+                    return voro
+            radius *= 2
+
+        return Voronoi(points)
+
     def get_all_voronoi_polyhedra(self, structure: Structure):
         """Get the Voronoi polyhedra for all site in a simulation cell.
 
@@ -805,7 +970,24 @@ class VoronoiNN(NearNeighbors):
         # the original unit cell. We start off with these central atoms to ensure they
         # are included in the tessellation
 
-        sites = [x.to_unit_cell() for x in structure]
+        # These are made neighbor objects that record their index and image, which
+        # saves searching the structure for them when extracting the NN info
+        sites = []
+        for idx, site in enumerate(structure):
+            unit_site = site.to_unit_cell()
+            image = tuple(round(coord) for coord in unit_site.frac_coords - site.frac_coords)
+            sites.append(
+                PeriodicNeighbor(
+                    unit_site.species,
+                    unit_site.frac_coords,
+                    unit_site.lattice,
+                    properties=unit_site.properties,
+                    nn_distance=0.0,
+                    index=idx,
+                    image=image,
+                    label=unit_site.label,
+                )
+            )
         indices = [(idx, 0, 0, 0) for idx in range(len(structure))]
 
         # Get all neighbors within a certain cutoff. Record both the list of these neighbors and the site indices.
@@ -814,37 +996,54 @@ class VoronoiNN(NearNeighbors):
             sites.extend([x[0] for x in neighs])
             indices.extend([(x[2],) + x[3] for x in neighs])
 
-        # Get the non-duplicates (using the site indices for numerical stability)
-        indices = np.array(indices, dtype=int)
-        indices, uniq_inds = np.unique(indices, return_index=True, axis=0)  # type: ignore[assignment]
+        # Get the non-duplicates (using the site indices for numerical stability).
+        # Each (site index, image) row is packed into a single integer key that sorts
+        # in the same order as the rows, as 1D unique is much faster than unique rows
+        index_rows = np.array(indices, dtype=np.int64)
+        offset = -int(index_rows[:, 1:].min())
+        images = index_rows[:, 1:] + offset
+        base = int(images.max()) + 1
+        keys = ((index_rows[:, 0] * base + images[:, 0]) * base + images[:, 1]) * base + images[:, 2]
+        keys, uniq_inds = np.unique(keys, return_index=True)
         sites = [sites[idx] for idx in uniq_inds]
 
-        # Sort array such that atoms in the root image are first
-        # Exploit the fact that the array is sorted by the unique operation such that
-        # the images associated with atom 0 are first, followed by atom 1, etc.
-        (root_images,) = np.nonzero(np.abs(indices[:, 1:]).max(axis=1) == 0)  # type: ignore[call-overload]
+        # Find the atoms in the root image
+        # Exploit the fact that the keys are sorted by the unique operation, so the
+        # key of each atom in the root image can be looked up by bisection
+        root_keys = ((np.arange(len(structure)) * base + offset) * base + offset) * base + offset
+        root_images = np.searchsorted(keys, root_keys)
 
-        del indices  # Save memory (tessellations can be costly)
+        del indices, index_rows, images, keys  # Save memory (tessellations can be costly)
 
-        # Run the tessellation
-        qvoronoi_input = [s.coords for s in sites if s is not None]
+        # Run the tessellation, converting all coordinates to Cartesian at once
+        qvoronoi_input = structure.lattice.get_cartesian_coords([site.frac_coords for site in sites])
         voro = Voronoi(qvoronoi_input)
 
+        # Group the faces by site once, rather than scanning every ridge in the
+        # tessellation again for each site in the root image
+        ridges_by_site = defaultdict(list)
+        for (site_a, site_b), vind in zip(voro.ridge_points.tolist(), voro.ridge_vertices):
+            ridges_by_site[site_a].append((site_b, vind))
+            ridges_by_site[site_b].append((site_a, vind))
+
         # Get the information for each neighbor
         return [
-            self._extract_cell_info(idx, sites, targets, voro, self.compute_adj_neighbors)
+            self._extract_cell_info(idx, sites, targets, voro, self.compute_adj_neighbors, ridges=ridges_by_site[idx])
             for idx in root_images.tolist()
         ]
 
-    def _extract_cell_info(self, site_idx, sites, targets, voro, compute_adj_neighbors=False):
+    def _extract_cell_info(self, site_idx, sites, targets, voro, compute_adj_neighbors=False, *, ridges=None):
         """Get the information about a certain atom from the results of a tessellation.
 
         Args:
             site_idx (int) - Index of the atom in question
-            sites ([Site]) - List of all sites in the tessellation
+            sites ([Site] | {int: Site}) - Sites in the tessellation, indexed by their
+                position in it. Only the sites sharing a face with the atom are used
             targets ([Element]) - Target elements
             voro - Output of qvoronoi
             compute_adj_neighbors (boolean) - Whether to compute which neighbors are adjacent
+            ridges ([(int, [int])]) - Index of the other site and the vertex indices for
+                each face of this atom. Found from voro.ridge_points if not provided
 
         Returns:
             A dict of sites sharing a common Voronoi facet. Key is facet id
@@ -863,69 +1062,61 @@ class VoronoiNN(NearNeighbors):
         # Get the coordinates of every vertex
         all_vertices = voro.vertices
 
-        # Get the coordinates of the central site
-        center_coords = sites[site_idx].coords
-
-        # Iterate through all the faces in the tessellation
-        results = {}
-        for nn, vind in voro.ridge_dict.items():
-            # Get only those that include the site in question
-            if site_idx in nn:
-                other_site = nn[0] if nn[1] == site_idx else nn[1]
-                if -1 in vind:
-                    # -1 indices correspond to the Voronoi cell
-                    #  missing a face
-                    if self.allow_pathological:
-                        continue
-
-                    raise RuntimeError("This structure is pathological, infinite vertex in the Voronoi construction")
-
-                # Get the solid angle of the face
-                facets = [all_vertices[idx] for idx in vind]
-                angle = solid_angle(center_coords, facets)
-
-                # Compute the volume of associated with this face
-                volume = 0
-                # qvoronoi returns vertices in CCW order, so I can break
-                # the face up in to segments (0,1,2), (0,2,3), ... to compute
-                # its area where each number is a vertex size
-                for j, k in zip(vind[1:], vind[2:]):
-                    volume += vol_tetra(
-                        center_coords,
-                        all_vertices[vind[0]],
-                        all_vertices[j],
-                        all_vertices[k],
-                    )
-
-                # Compute the distance of the site to the face
-                face_dist = np.linalg.norm(center_coords - sites[other_site].coords) / 2
+        # Get the coordinates of the central site, from the tessellation input
+        all_points = voro.points
+        center_coords = all_points[site_idx]
+
+        # Get only the faces that include the site in question
+        if ridges is None:
+            ridge_points = voro.ridge_points
+            rows = np.flatnonzero((ridge_points == site_idx).any(axis=1))
+            others = ridge_points[rows].sum(axis=1) - site_idx
+            ridges = [(other, voro.ridge_vertices[row]) for other, row in zip(others.tolist(), rows.tolist())]
+
+        # Iterate through all the faces of this atom
+        faces = []
+        for other_site, vind in ridges:
+            if -1 in vind:
+                # -1 indices correspond to the Voronoi cell
+                #  missing a face
+                if self.allow_pathological:
+                    continue
 
-                # Compute the area of the face (knowing V=Ad/3)
-                face_area = 3 * volume / face_dist
-
-                # Compute the normal of the facet
-                normal = np.subtract(sites[other_site].coords, center_coords)
-                normal /= np.linalg.norm(normal)
-
-                # Store by face index
-                results[other_site] = {
-                    "site": sites[other_site],
-                    "normal": normal,
-                    "solid_angle": angle,
-                    "volume": volume,
-                    "face_dist": face_dist,
-                    "area": face_area,
-                    "n_verts": len(vind),
-                }
+                raise RuntimeError("This structure is pathological, infinite vertex in the Voronoi construction")
 
-                # If we are computing which neighbors are adjacent, store the vertices
-                if compute_adj_neighbors:
-                    results[other_site]["verts"] = vind
+            # Get the solid angle of the face and the volume associated with it
+            angle, volume = _get_face_stats(center_coords, all_vertices[vind])
+            faces.append((other_site, vind, angle, volume))
 
         # all sites should have at least two connected ridges in periodic system
-        if len(results) == 0:
+        if len(faces) == 0:
             raise ValueError("No Voronoi neighbors found for site - try increasing cutoff")
 
+        # Compute the distance of the site to each face and the normal of each face,
+        # for all faces at once
+        deltas = all_points[[face[0] for face in faces]] - center_coords
+        dists = np.linalg.norm(deltas, axis=1)
+        face_dists = dists / 2
+        normals = deltas / dists[:, None]
+
+        results = {}
+        for (other_site, vind, angle, volume), face_dist, normal in zip(faces, face_dists, normals):
+            # Store by face index
+            results[other_site] = {
+                "site": sites[other_site],
+                "normal": normal,
+                "solid_angle": angle,
+                "volume": volume,
+                "face_dist": face_dist,
+                # Compute the area of the face (knowing V=Ad/3)
+                "area": 3 * volume / face_dist,
+                "n_verts": len(vind),
+            }
+
+            # If we are computing which neighbors are adjacent, store the vertices
+            if compute_adj_neighbors:
+                results[other_site]["verts"] = vind
+
         # Get only target elements
         result_weighted = {}
         for nn_index, nn_stats in results.items():
@@ -944,21 +1135,24 @@ class VoronoiNN(NearNeighbors):
             # Initialize storage for the adjacent neighbors
             adj_neighbors = {idx: [] for idx in result_weighted}
 
+            # Map each vertex to the faces that contain it, so the vertices shared
+            # by each pair of faces can be counted without comparing every pair
+            faces_by_vertex = defaultdict(list)
+            for nn_index, nn_stats in result_weighted.items():
+                for vertex in nn_stats["verts"]:
+                    faces_by_vertex[vertex].append(nn_index)
+
+            n_shared_verts: dict[tuple[int, int], int] = defaultdict(int)
+            for faces in faces_by_vertex.values():
+                for pair in combinations(faces, 2):
+                    n_shared_verts[pair] += 1
+
             # Find the neighbors that are adjacent by finding those
             #  that contain exactly two vertices
-            for a_ind, a_nn_info in result_weighted.items():
-                # Get the indices for this site
-                a_verts = set(a_nn_info["verts"])
-
-                # Loop over all neighbors that have an index lower that this one
-                # The goal here is to exploit the fact that neighbor adjacency is
-                # symmetric (if A is adj to B, B is adj to A)
-                for b_ind, b_nninfo in result_weighted.items():
-                    if b_ind > a_ind:
-                        continue
-                    if len(a_verts.intersection(b_nninfo["verts"])) == 2:
-                        adj_neighbors[a_ind].append(b_ind)
-                        adj_neighbors[b_ind].append(a_ind)
+            for (a_ind, b_ind), n_verts in n_shared_verts.items():
+                if n_verts == 2:
+                    adj_neighbors[a_ind].append(b_ind)
+                    adj_neighbors[b_ind].append(a_ind)
 
             # Store the results in the nn_info
             for key, neighbors in adj_neighbors.items():
@@ -995,41 +1189,49 @@ class VoronoiNN(NearNeighbors):
             All nn info for all sites.
         """
         all_voro_cells = self.get_all_voronoi_polyhedra(structure)
-        return [self._extract_nn_info(structure, cell) for cell in all_voro_cells]
+        targets = structure.elements if self.targets is None else self.targets
+        return [self._extract_nn_info(structure, cell, targets=targets) for cell in all_voro_cells]
 
-    def _extract_nn_info(self, structure: Structure, nns):
+    def _extract_nn_info(self, structure: Structure, nns, *, targets=None):
         """Given Voronoi NNs, extract the NN info in the form needed by NearestNeighbors.
 
         Args:
             structure (Structure): Structure being evaluated
             nns ([dicts]): Nearest neighbor information for a structure
+            targets ([Element]): Target elements. Determined from the structure
+                if not provided
 
         Returns:
             list[tuple[PeriodicSite, np.ndarray, float]]: tuples of the form
                 (site, image, weight). See nn_info.
         """
         # Get the target information
-        targets = structure.elements if self.targets is None else self.targets
+        if targets is None:
+            targets = structure.elements if self.targets is None else self.targets
+
+        # Test the weights and the targets of all the NNs at once
+        all_nstats = list(nns.values())
+        weights = np.fromiter((nstats[self.weight] for nstats in all_nstats), dtype=float, count=len(all_nstats))
+        max_weight = float(weights.max())
+        keep = (weights > self.tol * max_weight) & _mask_in_targets([nstats["site"] for nstats in all_nstats], targets)
 
         # Extract the NN info
         siw = []
-        max_weight = max(nn[self.weight] for nn in nns.values())
-        for nstats in nns.values():
+        for nstats in compress(all_nstats, keep.tolist()):
             site = nstats["site"]
-            if nstats[self.weight] > self.tol * max_weight and _is_in_targets(site, targets):
-                nn_info = {
-                    "site": site,
-                    "image": self._get_image(structure, site),
-                    "weight": nstats[self.weight] / max_weight,
-                    "site_index": self._get_original_site(structure, site),
-                }
+            nn_info = {
+                "site": site,
+                "image": self._get_image(structure, site),
+                "weight": nstats[self.weight] / max_weight,
+                "site_index": self._get_original_site(structure, site),
+            }
 
-                if self.extra_nn_info:
-                    # Add all the information about the site
-                    poly_info = nstats
-                    del poly_info["site"]
-                    nn_info["poly_info"] = poly_info
-                siw.append(nn_info)
+            if self.extra_nn_info:
+                # Add all the information about the site
+                poly_info = nstats
+                del poly_info["site"]
+                nn_info["poly_info"] = poly_info
+            siw.append(nn_info)
         return siw
 
 
@@ -1102,28 +1304,39 @@ class IsayevNN(VoronoiNN):
             format of the data for each site.
         """
         all_nns = self.get_all_voronoi_polyhedra(structure)
-        return [self._filter_nns(structure, n, nns) for n, nns in enumerate(all_nns)]
+        targets = structure.elements if self.targets is None else self.targets
+        return [self._filter_nns(structure, n, nns, targets=targets) for n, nns in enumerate(all_nns)]
 
-    def _filter_nns(self, structure: Structure, n: int, nns: dict[str, Any]) -> list[dict[str, Any]]:
+    def _filter_nns(
+        self,
+        structure: Structure,
+        n: int,
+        nns: dict[str, Any],
+        *,
+        targets: list[Element] | None = None,
+    ) -> list[dict[str, Any]]:
         """Extract and filter the NN info into the format needed by NearestNeighbors.
 
         Args:
             structure: The structure.
             n: The central site index.
             nns: Nearest neighbor information for the structure.
+            targets: Target elements. Determined from the structure if not provided.
 
         Returns:
             See get_nn_info for the format of the returned data.
         """
         # Get the target information
-        targets = structure.elements if self.targets is None else self.targets
+        if targets is None:
+            targets = structure.elements if self.targets is None else self.targets
 
         site = structure[n]
 
         # Extract the NN info
         siw = []
         max_weight = max(nn["area"] for nn in nns.values())
-        for nstats in nns.values():
+        in_targets = _mask_in_targets([nstats["site"] for nstats in nns.values()], targets).tolist()
+        for nstats, is_target in zip(nns.values(), in_targets):
             nn = nstats.pop("site")
 
             # use the Cordero radius if it is available, otherwise the atomic radius
@@ -1132,7 +1345,7 @@ class IsayevNN(VoronoiNN):
 
             # by default VoronoiNN only returns neighbors which share a Voronoi facet
             # therefore we don't need do to additional filtering based on the weight
-            if _is_in_targets(nn, targets) and nn_distance <= cov_distance + self.tol:
+            if is_target and nn_distance <= cov_distance + self.tol:
                 nn_info = {
                     "site": nn,
                     "image": self._get_image(structure, nn),
@@ -1161,6 +1374,30 @@ def _is_in_targets(site, targets):
     return all(elem in targets for elem in elems)
 
 
+def _mask_in_targets(sites, targets) -> np.ndarray:
+    """
+    Test whether each of a list of sites contains elements in the target list.
+
+    Whether a site is in the targets only depends on its species, so each
+    distinct set of species is only tested once.
+
+    Args:
+        sites ([Site]): Sites to assess
+        targets ([Element]) List of elements
+
+    Returns:
+        np.ndarray: Boolean mask of the sites that are in the targets
+    """
+    in_targets: dict[frozenset, bool] = {}
+    mask = np.empty(len(sites), dtype=bool)
+    for idx, site in enumerate(sites):
+        key = frozenset(site.species)
+        if key not in in_targets:
+            in_targets[key] = _is_in_targets(site, targets)
+        mask[idx] = in_targets[key]
+    return mask
+
+
 def _get_elements(site):
     """Get the list of elements for a Site.
 
@@ -1204,11 +1441,8 @@ class JmolNN(NearNeighbors):
         self.tol = tol
         self.min_bond_distance = min_bond_distance
 
-        # Load elemental radii table
-        bonds_file = f"{module_dir}/bonds_jmol_ob.yaml"
-        with open(bonds_file) as file:
-            yaml = YAML()
-            self.el_radius = yaml.load(file)
+        # Copy the elemental radii table, so updates stay local to this instance
+        self.el_radius = dict(_load_jmol_radii())
 
         # Update any user preference elemental radii
         if el_radius_updates:
@@ -1250,7 +1484,7 @@ class JmolNN(NearNeighbors):
         Returns:
             float: max bond length
         """
-        return math.sqrt((self.el_radius[el1_sym] + self.el_radius[el2_sym] + self.tol) ** 2)
+        return abs(self.el_radius[el1_sym] + self.el_radius[el2_sym] + self.tol)
 
     def get_nn_info(self, structure: Structure, n: int):
         """Get all near-neighbor sites as well as the associated image locations
@@ -1270,16 +1504,66 @@ class JmolNN(NearNeighbors):
         site = structure[n]
 
         # Determine relevant bond lengths based on atomic radii table
-        bonds = {}
-        for el in structure.elements:
-            bonds[site.specie, el] = self.get_max_bond_distance(site.specie.symbol, el.symbol)
+        bonds = self._get_bonds(site.specie, structure.elements)
 
         # Search for neighbors up to max bond length + tolerance
         max_rad = max(bonds.values()) + self.tol
+        return self._extract_nn_info(structure, site, bonds, structure.get_neighbors(site, max_rad))
+
+    def get_all_nn_info(self, structure: Structure) -> list[list[dict[str, Any]]]:
+        """Get a listing of all neighbors for all sites in a structure.
+
+        The neighbors of all sites are found in a single neighbor search, up to the
+        largest bond length of any site.
+
+        Args:
+            structure (Structure): Input structure
+
+        Returns:
+            List of NN site information for each site in the structure. Each
+                entry has the same format as `get_nn_info`
+        """
+        if not isinstance(structure, (Structure, IStructure)):
+            return super().get_all_nn_info(structure)
+
+        elements = structure.elements
+        bonds_by_specie = {specie: self._get_bonds(specie, elements) for specie in elements}
+        max_rad = max(max(bonds.values()) for bonds in bonds_by_specie.values()) + self.tol
+
+        return [
+            self._extract_nn_info(structure, site, bonds_by_specie[site.specie], neighbors)
+            for site, neighbors in zip(structure, structure.get_all_neighbors(max_rad))
+        ]
+
+    def _get_bonds(self, specie, elements):
+        """Get the maximum bond lengths between a specie and each of the elements.
+
+        Args:
+            specie (Element | Species): specie of the central site.
+            elements ([Element]): elements to bond to.
+
+        Returns:
+            dict[tuple[Element, Element], float]: maximum bond length for each
+                (specie, element) pair.
+        """
+        return {(specie, el): self.get_max_bond_distance(specie.symbol, el.symbol) for el in elements}
+
+    def _extract_nn_info(self, structure: Structure, site, bonds, neighbors):
+        """Select the bonded neighbors of a site from the neighbors within the search radius.
+
+        Args:
+            structure (Structure): input structure.
+            site (Site): site for which to determine near neighbors.
+            bonds (dict): maximum bond length for each (site specie, element) pair.
+            neighbors ([Neighbor]): neighbors of the site within the search radius.
+
+        Returns:
+            See get_nn_info for the format of the returned data.
+        """
         min_rad = min(bonds.values())
 
         siw = []
-        for nn in structure.get_neighbors(site, max_rad):
+        for nn in neighbors:
             dist = nn.nn_distance
             # Confirm neighbor based on bond length specific to atom pair
             if dist <= (bonds[(site.specie, nn.specie)]) and (nn.nn_distance > self.min_bond_distance):
@@ -1357,7 +1641,37 @@ class MinimumDistanceNN(NearNeighbors):
                 neighbor site, its image location, and its weight.
         """
         site = structure[n]
-        neighs_dists = structure.get_neighbors(site, self.cutoff)
+        return self._extract_nn_info(structure, structure.get_neighbors(site, self.cutoff))
+
+    def get_all_nn_info(self, structure: Structure) -> list[list[dict[str, Any]]]:
+        """Get a listing of all neighbors for all sites in a structure.
+
+        The neighbors of all sites are found in a single neighbor search.
+
+        Args:
+            structure (Structure): Input structure
+
+        Returns:
+            List of NN site information for each site in the structure. Each
+                entry has the same format as `get_nn_info`
+        """
+        if not isinstance(structure, (Structure, IStructure)):
+            return super().get_all_nn_info(structure)
+
+        return [
+            self._extract_nn_info(structure, neighs_dists) for neighs_dists in structure.get_all_neighbors(self.cutoff)
+        ]
+
+    def _extract_nn_info(self, structure: Structure, neighs_dists) -> list[dict[str, Any]]:
+        """Select the near neighbors of a site from the neighbors within the cutoff.
+
+        Args:
+            structure (Structure): input structure.
+            neighs_dists ([Neighbor]): neighbors of the site within the cutoff.
+
+        Returns:
+            See get_nn_info for the format of the returned data.
+        """
         is_periodic = isinstance(structure, (Structure, IStructure))
         siw = []
         if self.get_all_sites:
@@ -1462,8 +1776,7 @@ class OpenBabelNN(NearNeighbors):
 
         for neighbor in openbabel.OBAtomAtomIter(site_atom):
             coords = [neighbor.GetX(), neighbor.GetY(), neighbor.GetZ()]
-            site = next(a for a in structure if list(a.coords) == coords)
-            index = structure.index(site)
+            index, site = next((idx, a) for idx, a in enumerate(structure) if list(a.coords) == coords)
 
             bond = site_atom.GetBond(neighbor)
 
@@ -1484,7 +1797,9 @@ class OpenBabelNN(NearNeighbors):
 
         return siw
 
-    def get_bonded_structure(self, structure: Structure, decorate: bool = False) -> StructureGraph:  # type: ignore[override]
+    def get_bonded_structure(  # type: ignore[override]
+        self, structure: Structure, decorate: bool = False, *, n_jobs: int = 1
+    ) -> StructureGraph:
         """
         Obtain a MoleculeGraph object using this NearNeighbor
         class. Requires the optional dependency networkx
@@ -1495,6 +1810,9 @@ class OpenBabelNN(NearNeighbors):
             decorate (bool): whether to annotate site properties
             with order parameters using neighbors determined by
             this NearNeighbor class
+            n_jobs (int): Number of parallel jobs used to compute the order
+                parameters if decorate is True. Defaults to 1, i.e. no
+                parallelization.
 
         Returns:
             MoleculeGraph: object from pymatgen.analysis.graphs
@@ -1504,7 +1822,7 @@ class OpenBabelNN(NearNeighbors):
             # with site properties that provides information on the
             # coordination number and coordination pattern based
             # on the (current) structure of this graph.
-            order_parameters = [self.get_local_order_parameters(structure, n) for n in range(len(structure))]
+            order_parameters = self._get_all_local_order_parameters(structure, n_jobs=n_jobs)
             structure.add_site_property("order_parameters", order_parameters)
 
         return MoleculeGraph.from_local_env_strategy(structure, self)
@@ -1540,12 +1858,13 @@ class OpenBabelNN(NearNeighbors):
         sites = self._get_nn_shell_info(structure, all_nn_info, site_idx, shell)
 
         # Now update the site positions. Did not do this during NN options because that can be slower.
-        output = []
+        # As the species come from already validated sites, the checks of Site can be skipped
         for info in sites:
             orig_site = structure[info["site_index"]]
-            info["site"] = Site(orig_site.species, orig_site._coords, properties=orig_site.properties)
-            output.append(info)
-        return output
+            info["site"] = Site(
+                orig_site.species, orig_site.coords.copy(), properties=orig_site.properties, skip_checks=True
+            )
+        return sites
 
 
 class CovalentBondNN(NearNeighbors):
@@ -1610,13 +1929,18 @@ class CovalentBondNN(NearNeighbors):
         # current NearNeighbors scheme
         self.bonds = bonds = structure.get_covalent_bonds(tol=self.tol)
 
+        # The bonds are made from the sites of the molecule itself, so the sites
+        # can be matched by identity rather than by comparing them
+        center = structure[n]
+        site_indices = {id(site): idx for idx, site in enumerate(structure)}
+
         siw = []
 
         for bond in bonds:
-            if bond.site1 == structure[n]:
+            if bond.site1 is center:
                 site = bond.site2
                 capture_bond = True
-            elif bond.site2 == structure[n]:
+            elif bond.site2 is center:
                 site = bond.site1
                 capture_bond = True
             else:
@@ -1624,14 +1948,43 @@ class CovalentBondNN(NearNeighbors):
                 capture_bond = False
 
             if capture_bond:
-                index = structure.index(site)
+                index = site_indices[id(site)]
                 weight = bond.get_bond_order() if self.order else bond.length
 
                 siw.append({"site": site, "image": (0, 0, 0), "weight": weight, "site_index": index})
 
         return siw
 
-    def get_bonded_structure(self, structure: Structure, decorate: bool = False) -> MoleculeGraph:  # type: ignore[override]
+    def get_all_nn_info(self, structure: Structure) -> list[list[dict[str, Any]]]:
+        """Get a listing of all neighbors for all sites in a molecule.
+
+        The covalent bonds are only determined once, rather than once for each site.
+
+        Args:
+            structure: input Molecule.
+
+        Returns:
+            List of NN site information for each site in the molecule. Each
+                entry has the same format as `get_nn_info`
+        """
+        self.bonds = bonds = structure.get_covalent_bonds(tol=self.tol)
+
+        # The bonds are made from the sites of the molecule itself
+        site_indices = {id(site): idx for idx, site in enumerate(structure)}
+
+        all_nn_info: list[list[dict[str, Any]]] = [[] for _ in range(len(structure))]
+        for bond in bonds:
+            idx1, idx2 = site_indices[id(bond.site1)], site_indices[id(bond.site2)]
+            weight = bond.get_bond_order() if self.order else bond.length
+
+            all_nn_info[idx1].append({"site": bond.site2, "image": (0, 0, 0), "weight": weight, "site_index": idx2})
+            all_nn_info[idx2].append({"site": bond.site1, "image": (0, 0, 0), "weight": weight, "site_index": idx1})
+
+        return all_nn_info
+
+    def get_bonded_structure(  # type: ignore[override]
+        self, structure: Structure, decorate: bool = False, *, n_jobs: int = 1
+    ) -> MoleculeGraph:
         """
         Obtain a MoleculeGraph object using this NearNeighbor class.
 
@@ -1640,19 +1993,19 @@ class CovalentBondNN(NearNeighbors):
             decorate (bool): whether to annotate site properties
             with order parameters using neighbors determined by
             this NearNeighbor class
+            n_jobs (int): Number of parallel jobs used to compute the order
+                parameters if decorate is True. Defaults to 1, i.e. no
+                parallelization.
 
         Returns:
             MoleculeGraph: object from pymatgen.analysis.graphs
         """
-        # requires optional dependency which is why it's not a top-level import
-        from pymatgen.analysis.graphs import MoleculeGraph
-
         if decorate:
             # Decorate all sites in the underlying structure
             # with site properties that provides information on the
             # coordination number and coordination pattern based
             # on the (current) structure of this graph.
-            order_parameters = [self.get_local_order_parameters(structure, n) for n in range(len(structure))]
+            order_parameters = self._get_all_local_order_parameters(structure, n_jobs=n_jobs)
             structure.add_site_property("order_parameters", order_parameters)
 
         return MoleculeGraph.from_local_env_strategy(structure, self)
@@ -1688,12 +2041,13 @@ class CovalentBondNN(NearNeighbors):
         sites = self._get_nn_shell_info(structure, all_nn_info, site_idx, shell)
 
         # Now update the site positions. Did not do this during NN options because that can be slower.
-        output = []
+        # As the species come from already validated sites, the checks of Site can be skipped
         for info in sites:
             orig_site = structure[info["site_index"]]
-            info["site"] = Site(orig_site.species, orig_site._coords, properties=orig_site.properties)
-            output.append(info)
-        return output
+            info["site"] = Site(
+                orig_site.species, orig_site.coords.copy(), properties=orig_site.properties, skip_checks=True
+            )
+        return sites
 
 
 class MinimumOKeeffeNN(NearNeighbors):
@@ -1763,31 +2117,65 @@ class MinimumOKeeffeNN(NearNeighbors):
         except Exception:
             eln = site.species_string
 
-        reldists_neighs = []
+        el2s = []
         for nn in neighs_dists:
-            neigh = nn
-            dist = nn.nn_distance
             try:
-                el2 = neigh.specie.element
+                el2s.append(nn.specie.element)
             except Exception:
-                el2 = neigh.species_string
-            reldists_neighs.append([dist / get_okeeffe_distance_prediction(eln, el2), neigh])
+                el2s.append(nn.species_string)
 
-        siw = []
-        min_reldist = min(reldist for reldist, neigh in reldists_neighs)
-        for reldist, s in reldists_neighs:
-            if reldist < (1 + self.tol) * min_reldist:
-                w = min_reldist / reldist
-                siw.append(
-                    {
-                        "site": s,
-                        "image": self._get_image(structure, s),
-                        "weight": w,
-                        "site_index": self._get_original_site(structure, s),
-                    }
+        # The predicted bond length only depends on the pair of elements, so it is
+        # only computed once for each element and the relative distances all at once
+        predictions = {el2: get_okeeffe_distance_prediction(eln, el2) for el2 in set(el2s)}
+        dists = np.array([nn.nn_distance for nn in neighs_dists])
+        reldists = dists / np.array([predictions[el2] for el2 in el2s])
+
+        return _get_closest_relative_nn_info(structure, neighs_dists, reldists, self.tol)
+
+    def get_all_nn_info(self, structure: Structure) -> list[list[dict[str, Any]]]:
+        """Get a listing of all neighbors for all sites in a structure.
+
+        The neighbors of all sites are found in a single neighbor search and
+        only the selected ones are turned into PeriodicNeighbor objects.
+
+        Args:
+            structure (Structure): Input structure
+
+        Returns:
+            List of NN site information for each site in the structure. Each
+                entry has the same format as `get_nn_info`
+        """
+        if not isinstance(structure, (Structure, IStructure)):
+            return super().get_all_nn_info(structure)
+
+        elements = []
+        for site in structure:
+            try:
+                elements.append(site.specie.element)
+            except Exception:
+                elements.append(site.species_string)
+
+        # Label the elements with integers to find the element pairs in the
+        # neighbor list, and only predict the bond lengths of those pairs
+        distinct_els = list(dict.fromkeys(elements))
+        el_labels = {el: idx for idx, el in enumerate(distinct_els)}
+        site_labels = np.array([el_labels[el] for el in elements], dtype=int)
+        neighbor_list = structure.get_neighbor_list(self.cutoff)
+        center_indices, points_indices, _images, distances = neighbor_list
+        pairs, inverse = np.unique(
+            site_labels[center_indices] * len(distinct_els) + site_labels[points_indices], return_inverse=True
+        )
+        predictions = np.array(
+            [
+                get_okeeffe_distance_prediction(
+                    distinct_els[pair // len(distinct_els)], distinct_els[pair % len(distinct_els)]
                 )
+                for pair in pairs.tolist()
+            ]
+        )
+        reldists = distances / predictions[inverse.reshape(-1)]
 
-        return siw
+        return _get_all_closest_relative_nn_info(structure, neighbor_list, reldists, self.tol)
 
 
 class MinimumVIRENN(NearNeighbors):
@@ -1846,49 +2234,132 @@ class MinimumVIRENN(NearNeighbors):
         neighs_dists = vire.structure.get_neighbors(site, self.cutoff)
         rn = vire.radii[vire.structure[n].species_string]
 
-        reldists_neighs = []
-        for nn in neighs_dists:
-            reldists_neighs.append([nn.nn_distance / (vire.radii[nn.species_string] + rn), nn])
+        # Compute the relative distances of all the neighbors at once
+        dists = np.array([nn.nn_distance for nn in neighs_dists])
+        radii = np.array([vire.radii[nn.species_string] for nn in neighs_dists])
+        reldists = dists / (radii + rn)
 
-        siw = []
-        min_reldist = min(reldist for reldist, neigh in reldists_neighs)
-        for reldist, s in reldists_neighs:
-            if reldist < (1 + self.tol) * min_reldist:
-                w = min_reldist / reldist
-                siw.append(
-                    {
-                        "site": s,
-                        "image": self._get_image(vire.structure, s),
-                        "weight": w,
-                        "site_index": self._get_original_site(vire.structure, s),
-                    }
-                )
+        return _get_closest_relative_nn_info(vire.structure, neighs_dists, reldists, self.tol)
 
-        return siw
+    def get_all_nn_info(self, structure: Structure) -> list[list[dict[str, Any]]]:
+        """Get a listing of all neighbors for all sites in a structure.
 
+        The neighbors of all sites are found in a single neighbor search and
+        only the selected ones are turned into PeriodicNeighbor objects.
 
-def _get_vire(structure: Structure | IStructure):
-    """Get the ValenceIonicRadiusEvaluator object for a structure taking
-    advantage of caching.
+        Args:
+            structure (Structure): Input structure
+
+        Returns:
+            List of NN site information for each site in the structure. Each
+                entry has the same format as `get_nn_info`
+        """
+        vire = _get_vire(structure)
+        vire_structure = vire.structure
+        radii = vire.radii
+        site_radii = np.array([radii[site.species_string] for site in vire_structure])
+        neighbor_list = vire_structure.get_neighbor_list(self.cutoff)
+        center_indices, points_indices, _images, distances = neighbor_list
+        reldists = distances / (site_radii[center_indices] + site_radii[points_indices])
+
+        return _get_all_closest_relative_nn_info(vire_structure, neighbor_list, reldists, self.tol)
+
+
+def _get_closest_relative_nn_info(structure: Structure, neighbors, reldists: np.ndarray, tol: float):
+    """Select the neighbors within a relative tolerance of the closest relative
+    distance, in the format of get_nn_info.
 
     Args:
-        structure: A structure.
+        structure (Structure): input structure.
+        neighbors ([PeriodicNeighbor]): neighbors of the site.
+        reldists (np.ndarray): relative distance of each neighbor.
+        tol (float): tolerance parameter for neighbor identification.
 
     Returns:
-        Output of `ValenceIonicRadiusEvaluator(structure)`
+        list[dict]: NN info of the selected neighbors, weighted by the ratio of
+            the closest relative distance to their own.
+    """
+    siw = []
+    min_reldist = float(reldists.min())
+    for idx in np.flatnonzero(reldists < (1 + tol) * min_reldist).tolist():
+        site = neighbors[idx]
+        siw.append(
+            {
+                "site": site,
+                "image": NearNeighbors._get_image(structure, site),
+                "weight": min_reldist / float(reldists[idx]),
+                "site_index": NearNeighbors._get_original_site(structure, site),
+            }
+        )
+
+    return siw
+
+
+def _get_all_closest_relative_nn_info(
+    structure: Structure,
+    neighbor_list: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+    reldists: np.ndarray,
+    tol: float,
+) -> list[list[dict[str, Any]]]:
+    """Select the neighbors of all sites within a relative tolerance of their
+    closest relative distance, in the format of get_all_nn_info.
+
+    Args:
+        structure (Structure): input structure.
+        neighbor_list (tuple): output of `structure.get_neighbor_list`, i.e.
+            (center_indices, points_indices, offset_vectors, distances).
+        reldists (np.ndarray): relative distance of each neighbor pair.
+        tol (float): tolerance parameter for neighbor identification.
+
+    Returns:
+        list[list[dict]]: NN info of the selected neighbors of each site,
+            weighted by the ratio of the closest relative distance to their own.
     """
-    # pymatgen does not hash Structure objects, so we need
-    # to cast from Structure to the immutable IStructure
-    if isinstance(structure, Structure):
-        structure = IStructure.from_sites(structure)
+    center_indices, points_indices, images, distances = neighbor_list
+    # Group the pairs by center, keeping their order in the neighbor list
+    order = np.argsort(center_indices, kind="stable")
+    bounds = np.searchsorted(center_indices[order], np.arange(len(structure) + 1))
+
+    frac_coords = structure.frac_coords
+    lattice = structure.lattice
+    all_nn_info = []
+    for start, end in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+        pairs = order[start:end]
+        min_reldist = float(reldists[pairs].min())
+        siw = []
+        for pair in pairs[reldists[pairs] < (1 + tol) * min_reldist].tolist():
+            site = structure[points_indices[pair]]
+            image = tuple(images[pair])
+            neighbor = PeriodicNeighbor(
+                species=site.species,
+                coords=frac_coords[points_indices[pair]] + images[pair],
+                lattice=lattice,
+                properties=site.properties,
+                nn_distance=distances[pair],
+                index=points_indices[pair],
+                image=image,
+                label=site.label,
+            )
+            siw.append(
+                {
+                    "site": neighbor,
+                    "image": image,
+                    "weight": min_reldist / float(reldists[pair]),
+                    "site_index": neighbor.index,
+                }
+            )
+        all_nn_info.append(siw)
+
+    return all_nn_info
 
-    return _get_vire_istructure(structure)
 
+# The last ValenceIonicRadiusEvaluator computed by _get_vire, with its key
+_VIRE_CACHE: dict[tuple, ValenceIonicRadiusEvaluator] = {}
 
-@lru_cache(maxsize=1)
-def _get_vire_istructure(structure: IStructure):
-    """Get the ValenceIonicRadiusEvaluator object for an immutable structure
-    taking advantage of caching.
+
+def _get_vire(structure: Structure | IStructure):
+    """Get the ValenceIonicRadiusEvaluator object for a structure taking
+    advantage of caching.
 
     Args:
         structure: A structure.
@@ -1896,7 +2367,21 @@ def _get_vire_istructure(structure: IStructure):
     Returns:
         Output of `ValenceIonicRadiusEvaluator(structure)`
     """
-    return ValenceIonicRadiusEvaluator(structure)
+    # Key the cache on the lattice and the sites in order, which is cheaper than
+    # copying the structure to compare it and, unlike structure equality, tells
+    # apart structures with the same sites in a different order
+    key = (
+        structure.lattice.matrix.tobytes(),
+        structure.frac_coords.tobytes(),
+        tuple((site.species, site.label, repr(site.properties)) for site in structure),
+    )
+    vire = _VIRE_CACHE.get(key)
+    if vire is None:
+        vire = ValenceIonicRadiusEvaluator(structure)
+        _VIRE_CACHE.clear()
+        _VIRE_CACHE[key] = vire
+
+    return vire
 
 
 def solid_angle(center, coords):
@@ -1911,30 +2396,15 @@ def solid_angle(center, coords):
     Returns:
         The solid angle.
     """
-    # Compute the displacement from the center
-    disp = [np.subtract(c, center) for c in coords]
-
-    # Compute the magnitude of each vector
-    r_norm = [np.linalg.norm(idx) for idx in disp]
-
-    # Compute the solid angle for each tetrahedron that makes up the facet
-    #  Following: https://wikipedia.org/wiki/Solid_angle#Tetrahedron
-    angle = 0
-    for ii in range(1, len(disp) - 1):
-        jj = ii + 1
-        tp = np.abs(np.dot(disp[0], np.cross(disp[ii], disp[jj])))
-        de = (
-            r_norm[0] * r_norm[ii] * r_norm[jj]
-            + r_norm[jj] * np.dot(disp[0], disp[ii])
-            + r_norm[ii] * np.dot(disp[0], disp[jj])
-            + r_norm[0] * np.dot(disp[ii], disp[jj])
-        )
-        _angle = (0.5 * math.pi if tp > 0 else -0.5 * math.pi) if de == 0 else np.arctan(tp / de)
-        angle += (_angle if _angle > 0 else _angle + math.pi) * 2
+    # At least three coords are needed to span a facet
+    if len(coords) < 3:
+        return 0.0
 
-    return angle
+    # The solid angle is computed by the same compiled kernel as the Voronoi faces
+    return _get_face_stats(np.asarray(center, dtype=float), np.ascontiguousarray(coords, dtype=float))[0]
 
 
+@njit
 def vol_tetra(vt1, vt2, vt3, vt4):
     """
     Calculate the volume of a tetrahedron, given the four vertices of vt1,
@@ -1949,9 +2419,57 @@ def vol_tetra(vt1, vt2, vt3, vt4):
     Returns:
         float: volume of the tetrahedron.
     """
-    return np.abs(np.dot((vt1 - vt4), np.cross((vt2 - vt4), (vt3 - vt4)))) / 6
+    # Edge vectors from the fourth vertex, kept as scalars for the compiled kernel
+    ax, ay, az = vt1[0] - vt4[0], vt1[1] - vt4[1], vt1[2] - vt4[2]
+    bx, by, bz = vt2[0] - vt4[0], vt2[1] - vt4[1], vt2[2] - vt4[2]
+    cx, cy, cz = vt3[0] - vt4[0], vt3[1] - vt4[1], vt3[2] - vt4[2]
+    return abs(ax * (by * cz - bz * cy) + ay * (bz * cx - bx * cz) + az * (bx * cy - by * cx)) / 6
+
+
+@njit
+def _get_face_stats(center, vertices):
+    """
+    Calculate the solid angle of a Voronoi face seen from the center and the
+    volume of the pyramid spanned by the face and the center.
 
+    qvoronoi returns vertices in CCW order, so the face is broken up into the
+    triangles (0,1,2), (0,2,3), ... which give both the solid angle and the
+    volume of the tetrahedra with the center.
 
+    Args:
+        center (3x1 array): Center to measure solid angle from.
+        vertices (Nx3 array): Vertices of the face, in order.
+
+    Returns:
+        tuple[float, float]: solid angle and volume.
+    """
+    disp = vertices - center
+    r_norm = np.sqrt(np.sum(disp * disp, axis=1))
+
+    angle = 0.0
+    volume = 0.0
+    for ii in range(1, len(disp) - 1):
+        jj = ii + 1
+        # Triple product and scalar products of the displacement vectors
+        tp = abs(
+            disp[0, 0] * (disp[ii, 1] * disp[jj, 2] - disp[ii, 2] * disp[jj, 1])
+            + disp[0, 1] * (disp[ii, 2] * disp[jj, 0] - disp[ii, 0] * disp[jj, 2])
+            + disp[0, 2] * (disp[ii, 0] * disp[jj, 1] - disp[ii, 1] * disp[jj, 0])
+        )
+        dot_0i = disp[0, 0] * disp[ii, 0] + disp[0, 1] * disp[ii, 1] + disp[0, 2] * disp[ii, 2]
+        dot_0j = disp[0, 0] * disp[jj, 0] + disp[0, 1] * disp[jj, 1] + disp[0, 2] * disp[jj, 2]
+        dot_ij = disp[ii, 0] * disp[jj, 0] + disp[ii, 1] * disp[jj, 1] + disp[ii, 2] * disp[jj, 2]
+        de = r_norm[0] * r_norm[ii] * r_norm[jj] + r_norm[jj] * dot_0i + r_norm[ii] * dot_0j + r_norm[0] * dot_ij
+
+        # Same as solid_angle and vol_tetra
+        _angle = (0.5 * math.pi if tp > 0 else -0.5 * math.pi) if de == 0 else math.atan(tp / de)
+        angle += (_angle if _angle > 0 else _angle + math.pi) * 2
+        volume += tp / 6
+
+    return angle, volume
+
+
+@cache
 def get_okeeffe_params(el_symbol):
     """Get the elemental parameters related to atom size and electronegativity which are
     used for estimating bond-valence parameters (bond length) of pairs of atoms on the
@@ -1964,16 +2482,17 @@ def get_okeeffe_params(el_symbol):
     Returns:
         dict: atom-size ('r') and electronegativity-related ('c') parameter.
     """
-    el = Element(el_symbol)
-    if el not in list(BV_PARAMS):
+    params = BV_PARAMS.get(Element(el_symbol))
+    if params is None:
         raise RuntimeError(
             "Could not find O'Keeffe parameters for element"
             f' {el_symbol!r} in "BV_PARAMS" dictionary provided by pymatgen'
         )
 
-    return BV_PARAMS[el]
+    return params
 
 
+@cache
 def get_okeeffe_distance_prediction(el1, el2):
     """Get an estimate of the bond valence parameter (bond length) using
     the derived parameters from 'Atoms Sizes and Bond Lengths in Molecules
@@ -2031,6 +2550,37 @@ def get_neighbors_of_site_with_index(struct, n, approach="min_dist", delta=0.1,
     raise RuntimeError(f"unsupported neighbor-finding method ({approach}).")
 
 
+# Criteria of the motifs recognized by site_is_of_motif_type for each coordination
+# number: the motif, the order parameter and threshold key that identify it, and
+# (order parameter, threshold key) pairs that must stay below their thresholds
+_MOTIF_CRITERIA: dict[int, list[tuple[str, str, str, tuple[tuple[str, str], ...]]]] = {
+    4: [("tetrahedral", "tet", "qtet", ())],
+    5: [("square pyramidal", "sq_pyr", "qsqpyr", ()), ("trigonal bipyramidal", "tri_bipyr", "qtribipyr", ())],
+    6: [("octahedral", "oct", "qoct", ())],
+    8: [("bcc", "bcc", "qbcc", (("tet", "qtet"),))],
+    12: [("cp", "q6", "q6", (("tet", "q6"), ("oct", "q6"), ("bcc", "q6")))],
+}
+
+
+@cache
+def _get_motif_order_params(cn: int) -> tuple[list[str], LocalStructOrderParams]:
+    """Get the order parameters needed to recognize the motifs of a coordination number.
+
+    Args:
+        cn (int): coordination number, must be a key of _MOTIF_CRITERIA.
+
+    Returns:
+        tuple[list[str], LocalStructOrderParams]: order parameter types and their
+            calculator, whose results are in the same order as the types.
+    """
+    types = []
+    for _, typ, _, below in _MOTIF_CRITERIA[cn]:
+        for other in (typ, *(other_typ for other_typ, _ in below)):
+            if other not in types:
+                types.append(other)
+    return types, LocalStructOrderParams(types)
+
+
 def site_is_of_motif_type(struct, n, approach="min_dist", delta=0.1, cutoff=10, thresh=None):
     """Get the motif type of the site with index n in structure struct;
     currently featuring "tetrahedral", "octahedral", "bcc", and "cp"
@@ -2059,39 +2609,23 @@ def site_is_of_motif_type(struct, n, approach="min_dist", delta=0.1, cutoff=10,
     if thresh is None:
         thresh = {"qtet": 0.5, "qoct": 0.5, "qbcc": 0.5, "q6": 0.4, "qtribipyr": 0.8, "qsqpyr": 0.8}
 
-    ops = LocalStructOrderParams(["cn", "tet", "oct", "bcc", "q6", "sq_pyr", "tri_bipyr"])
-
     neighs_cent = get_neighbors_of_site_with_index(struct, n, approach=approach, delta=delta, cutoff=cutoff)
-    neighs_cent.append(struct[n])
-    opvals = ops.get_order_parameters(
-        neighs_cent,
-        len(neighs_cent) - 1,
-        indices_neighs=list(range(len(neighs_cent) - 1)),
-    )
-    cn = int(opvals[0] + 0.5)
+    cn = len(neighs_cent)
     motif_type = "unrecognized"
     nmotif = 0
 
-    if cn == 4 and opvals[1] > thresh["qtet"]:
-        motif_type = "tetrahedral"
-        nmotif += 1
-    if cn == 5 and opvals[5] > thresh["qsqpyr"]:
-        motif_type = "square pyramidal"
-        nmotif += 1
-    if cn == 5 and opvals[6] > thresh["qtribipyr"]:
-        motif_type = "trigonal bipyramidal"
-        nmotif += 1
-    if cn == 6 and opvals[2] > thresh["qoct"]:
-        motif_type = "octahedral"
-        nmotif += 1
-    if cn == 8 and (opvals[3] > thresh["qbcc"] and opvals[1] < thresh["qtet"]):
-        motif_type = "bcc"
-        nmotif += 1
-    if cn == 12 and (
-        opvals[4] > thresh["q6"] and opvals[1] < thresh["q6"] and opvals[2] < thresh["q6"] and opvals[3] < thresh["q6"]
-    ):
-        motif_type = "cp"
-        nmotif += 1
+    # Only the order parameters of the motifs with this coordination number are computed
+    if cn not in _MOTIF_CRITERIA:
+        return motif_type
+
+    types, ops = _get_motif_order_params(cn)
+    neighs_cent.append(struct[n])
+    opvals = dict(zip(types, ops.get_order_parameters(neighs_cent, cn, indices_neighs=list(range(cn)))))
+
+    for motif, typ, thresh_key, below in _MOTIF_CRITERIA[cn]:
+        if opvals[typ] > thresh[thresh_key] and all(opvals[other] < thresh[key] for other, key in below):
+            motif_type = motif
+            nmotif += 1
 
     if nmotif > 1:
         motif_type = "multiple assignments"
@@ -2099,6 +2633,7 @@ def site_is_of_motif_type(struct, n, approach="min_dist", delta=0.1, cutoff=10,
     return motif_type
 
 
+@njit
 def gramschmidt(vin, uin):
     """Get that part of the first input vector
     that is orthogonal to the second input vector.
@@ -2110,13 +2645,532 @@ def gramschmidt(vin, uin):
         uin (numpy array):
             second input vector
     """
-    vin_uin = np.inner(vin, uin)
-    uin_uin = np.inner(uin, uin)
+    # Accumulate the inner products as scalars, which the compiled kernel turns
+    # into a few floating point operations for the usual 3-vectors
+    vin_uin = 0.0
+    uin_uin = 0.0
+    for idx in range(len(uin)):
+        vin_uin += vin[idx] * uin[idx]
+        uin_uin += uin[idx] * uin[idx]
     if uin_uin <= 0.0:
         raise ValueError("Zero or negative inner product!")
     return vin - (vin_uin / uin_uin) * uin
 
 
+# Normalization constants of the spherical harmonics Y_l_m used by _get_boop,
+# indexed by l and m >= 0
+_Y_LM_NORMS = (
+    (0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0),
+    (0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0),
+    (
+        1 / 4 * math.sqrt(5 / math.pi),
+        1 / 2 * math.sqrt(15 / (2 * math.pi)),
+        1 / 4 * math.sqrt(15 / (2 * math.pi)),
+        0.0,
+        0.0,
+        0.0,
+        0.0,
+    ),
+    (0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0),
+    (
+        3 / 16 * math.sqrt(1 / math.pi),
+        3 / 8 * math.sqrt(5 / math.pi),
+        3 / 8 * math.sqrt(5 / (2 * math.pi)),
+        3 / 8 * math.sqrt(35 / math.pi),
+        3 / 16 * math.sqrt(35 / (2 * math.pi)),
+        0.0,
+        0.0,
+    ),
+    (0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0),
+    (
+        1 / 32 * math.sqrt(13 / math.pi),
+        1 / 16 * math.sqrt(273 / (2 * math.pi)),
+        1 / 64 * math.sqrt(1365 / math.pi),
+        1 / 32 * math.sqrt(1365 / math.pi),
+        3 / 32 * math.sqrt(91 / (2 * math.pi)),
+        3 / 32 * math.sqrt(1001 / math.pi),
+        1 / 64 * math.sqrt(3003 / math.pi),
+    ),
+)
+
+
+@njit
+def _get_boop(x, y, z, l_ang):
+    """Calculate the bond orientational order parameter q_l of weight
+    l = 2, 4 or 6 in a single pass over the neighbors.
+
+    The spherical harmonics are evaluated from the Cartesian components of
+    the normalized bond vectors, sin(theta)^m * exp(i * m * phi) being
+    (x + i * y)^m and cos(theta) being z, so that no angles are needed.
+
+    Args:
+        x (numpy array): x components of the normalized bond vectors.
+        y (numpy array): y components of the normalized bond vectors.
+        z (numpy array): z components of the normalized bond vectors.
+        l_ang (int): weight l of the order parameter.
+
+    Returns:
+        float: bond orientational order parameter q_l.
+    """
+    if l_ang not in (2, 4, 6):
+        raise ValueError("Only q2, q4 and q6 are implemented!")
+
+    # Sums of the real and imaginary parts of Y_l_m over the neighbors for
+    # m >= 0, Y_l_-m only differs in signs and is accounted for at the end
+    real = [0.0] * (l_ang + 1)
+    imag = [0.0] * (l_ang + 1)
+    # Factors of Y_l_m that only depend on z
+    pre_y = [0.0] * (l_ang + 1)
+    norms = _Y_LM_NORMS[l_ang]
+    for idx in range(len(x)):
+        xi = float(x[idx])
+        yi = float(y[idx])
+        ct = float(z[idx])
+        ct2 = ct * ct
+        if l_ang == 2:
+            pre_y[0] = 3 * ct2 - 1.0
+            pre_y[1] = ct
+            pre_y[2] = 1.0
+        elif l_ang == 4:
+            pre_y[0] = (35 * ct2 - 30) * ct2 + 3.0
+            pre_y[1] = ct * (7 * ct2 - 3)
+            pre_y[2] = 7 * ct2 - 1.0
+            pre_y[3] = ct
+            pre_y[4] = 1.0
+        else:
+            pre_y[0] = ((231 * ct2 - 315) * ct2 + 105) * ct2 - 5.0
+            pre_y[1] = ct * ((33 * ct2 - 30) * ct2 + 5)
+            pre_y[2] = (33 * ct2 - 18) * ct2 + 1.0
+            pre_y[3] = ct * (11 * ct2 - 3)
+            pre_y[4] = 11 * ct2 - 1.0
+            pre_y[5] = ct
+            pre_y[6] = 1.0
+
+        real[0] += norms[0] * pre_y[0]
+        # Real and imaginary parts of (x + i * y)^m
+        re_m = 1.0
+        im_m = 0.0
+        for m in range(1, l_ang + 1):
+            re_m, im_m = re_m * xi - im_m * yi, im_m * xi + re_m * yi
+            real[m] += norms[m] * pre_y[m] * re_m
+            imag[m] += norms[m] * pre_y[m] * im_m
+
+    acc = real[0] * real[0]
+    for m in range(1, l_ang + 1):
+        acc += 2 * (real[m] * real[m] + imag[m] * imag[m])
+
+    n_nn = len(x)
+    return math.sqrt(4 * math.pi * acc / ((2 * l_ang + 1) * float(n_nn * n_nn)))
+
+
+@njit
+def _get_boops(x, y, z, n_neighbors, l_ang):
+    """Calculate the bond orientational order parameter q_l of many sites.
+
+    Args:
+        x (numpy array): x components of the normalized bond vectors of
+            each site, padded to the largest number of neighbors.
+        y (numpy array): y components, padded as x.
+        z (numpy array): z components, padded as x.
+        n_neighbors (numpy array): number of neighbors of each site.
+        l_ang (int): weight l of the order parameter.
+
+    Returns:
+        numpy array: q_l of each site, NaN for sites without neighbors.
+    """
+    q_l = np.full(len(n_neighbors), np.nan)
+    for site_idx in range(len(n_neighbors)):
+        n_nn = n_neighbors[site_idx]
+        if n_nn > 0:
+            q_l[site_idx] = _get_boop(x[site_idx, :n_nn], y[site_idx, :n_nn], z[site_idx, :n_nn], l_ang)
+    return q_l
+
+
+# Integer codes of the order parameter types handled by _accumulate_geomops,
+# the types not listed there are -1
+(
+    _BENT,
+    _SQ_PYR_LEGACY,
+    _TRI_PLAN,
+    _TET,
+    _TRI_PLAN_MAX,
+    _TET_MAX,
+    _T,
+    _TRI_PYR,
+    _SQ_PYR,
+    _PENT_PYR,
+    _HEX_PYR,
+    _SQ_PLAN,
+    _OCT,
+    _OCT_LEGACY,
+    _CUBOCT,
+    _CUBOCT_MAX,
+    _SEE_SAW_RECT,
+    _TRI_BIPYR,
+    _SQ_BIPYR,
+    _PENT_BIPYR,
+    _HEX_BIPYR,
+    _OCT_MAX,
+    _SQ_PLAN_MAX,
+    _HEX_PLAN_MAX,
+    _PENT_PLAN,
+    _PENT_PLAN_MAX,
+    _BCC,
+    _SQ_FACE_CAP_TRIG_PRIS,
+) = range(28)
+_GEOMOP_TYPE_CODES = {
+    "bent": _BENT,
+    "sq_pyr_legacy": _SQ_PYR_LEGACY,
+    "tri_plan": _TRI_PLAN,
+    "tet": _TET,
+    "tri_plan_max": _TRI_PLAN_MAX,
+    "tet_max": _TET_MAX,
+    "T": _T,
+    "tri_pyr": _TRI_PYR,
+    "sq_pyr": _SQ_PYR,
+    "pent_pyr": _PENT_PYR,
+    "hex_pyr": _HEX_PYR,
+    "sq_plan": _SQ_PLAN,
+    "oct": _OCT,
+    "oct_legacy": _OCT_LEGACY,
+    "cuboct": _CUBOCT,
+    "cuboct_max": _CUBOCT_MAX,
+    "see_saw_rect": _SEE_SAW_RECT,
+    "tri_bipyr": _TRI_BIPYR,
+    "sq_bipyr": _SQ_BIPYR,
+    "pent_bipyr": _PENT_BIPYR,
+    "hex_bipyr": _HEX_BIPYR,
+    "oct_max": _OCT_MAX,
+    "sq_plan_max": _SQ_PLAN_MAX,
+    "hex_plan_max": _HEX_PLAN_MAX,
+    "pent_plan": _PENT_PLAN,
+    "pent_plan_max": _PENT_PLAN_MAX,
+    "bcc": _BCC,
+    "sq_face_cap_trig_pris": _SQ_FACE_CAP_TRIG_PRIS,
+}
+
+# Settings of the order parameters used by _accumulate_geomops, in the order
+# of the columns of the parameter matrix, absent settings being NaN
+_GEOMOP_PARAM_KEYS = (
+    "TA",
+    "IGW_TA",
+    "IGW_EP",
+    "fac_AA",
+    "exp_cos_AA",
+    "min_SPP",
+    "IGW_SPP",
+    "w_SPP",
+    2,
+    4,
+    5,
+    6,
+    7,
+    "TA1",
+    "TA2",
+    "TA3",
+    "IGW_TA1",
+    "IGW_TA2",
+    "fac_AA1",
+    "exp_cos_AA1",
+    "fac_AA2",
+    "shift_AA2",
+    "exp_cos_AA2",
+)
+(
+    _TA,
+    _IGW_TA,
+    _IGW_EP,
+    _FAC_AA,
+    _EXP_COS_AA,
+    _MIN_SPP,
+    _IGW_SPP,
+    _W_SPP,
+    _P2,
+    _P4,
+    _P5,
+    _P6,
+    _P7,
+    _TA1,
+    _TA2,
+    _TA3,
+    _IGW_TA1,
+    _IGW_TA2,
+    _FAC_AA1,
+    _EXP_COS_AA1,
+    _FAC_AA2,
+    _SHIFT_AA2,
+    _EXP_COS_AA2,
+) = range(len(_GEOMOP_PARAM_KEYS))
+
+# Settings read by _accumulate_geomops for each type code, which must all be
+# given as absent settings would silently enter the kernel as NaN
+_GEOMOP_REQUIRED_KEYS: dict[int, tuple[str | int, ...]] = {
+    **dict.fromkeys((_BENT, _SQ_PYR_LEGACY, _PENT_PLAN, _PENT_PLAN_MAX), ("TA", "IGW_TA")),
+    **dict.fromkeys((_TRI_PLAN, _TRI_PLAN_MAX, _TET, _TET_MAX), ("TA", "IGW_TA", "fac_AA", "exp_cos_AA")),
+    **dict.fromkeys((_T, _TRI_PYR, _SQ_PYR, _PENT_PYR, _HEX_PYR), ("IGW_EP", "fac_AA", "exp_cos_AA")),
+    **dict.fromkeys((_SQ_PLAN, _OCT), ("min_SPP", "IGW_SPP", "w_SPP", "IGW_EP", "fac_AA", "exp_cos_AA")),
+    _OCT_LEGACY: ("min_SPP", "IGW_SPP", "w_SPP", "IGW_EP", "fac_AA", "exp_cos_AA", 6, 7),
+    **dict.fromkeys((_CUBOCT, _CUBOCT_MAX), ("min_SPP", "IGW_SPP", "w_SPP", 2, 4, 5, 6)),
+    **dict.fromkeys(
+        (_SEE_SAW_RECT, _TRI_BIPYR, _SQ_BIPYR, _PENT_BIPYR, _HEX_BIPYR, _OCT_MAX, _SQ_PLAN_MAX),
+        ("min_SPP", "IGW_SPP", "IGW_EP", "fac_AA", "exp_cos_AA"),
+    ),
+    _HEX_PLAN_MAX: ("min_SPP", "IGW_SPP", "TA", "IGW_TA", "fac_AA", "exp_cos_AA"),
+    _BCC: ("min_SPP", "IGW_SPP", "w_SPP"),
+    _SQ_FACE_CAP_TRIG_PRIS: (
+        "TA1",
+        "TA2",
+        "TA3",
+        "IGW_TA1",
+        "IGW_TA2",
+        "fac_AA1",
+        "exp_cos_AA1",
+        "fac_AA2",
+        "shift_AA2",
+        "exp_cos_AA2",
+    ),
+}
+
+
+@njit
+def _accumulate_geomops(
+    j,
+    type_codes,
+    params,
+    qsp_theta,
+    norms,
+    *,
+    cos_aa_settings,
+    cos_aa_indices,
+    thetas,
+    flags_xaxis,
+    phis,
+    phi2s,
+    flags_yaxis,
+):
+    """Accumulate the contributions of all angles j-i-k and j-i-m to the
+    Peters-style order parameters, neighbor j being put to the North pole
+    and neighbor k defining the prime meridian.
+
+    Args:
+        j (int): index of the neighbor at the North pole.
+        type_codes (numpy array): integer codes of the order parameter types.
+        params (numpy array): settings of the order parameters, one row per
+            type and one column per entry of _GEOMOP_PARAM_KEYS.
+        qsp_theta (numpy array): contributions of neighbor j, one row per
+            type and one column per neighbor k != j, filled in place.
+        norms (numpy array): normalizations of the contributions, shaped
+            and filled as qsp_theta.
+        cos_aa_settings (numpy array): distinct pairs of "fac_AA" and
+            "exp_cos_AA" settings, the cosine term of each pair being
+            evaluated once per azimuth angle.
+        cos_aa_indices (numpy array): row of cos_aa_settings used by each
+            type, -1 for types without such settings.
+        thetas (numpy array): polar angles of all neighbors.
+        flags_xaxis (numpy array): whether the component of a neighbor
+            orthogonal to neighbor j vanishes.
+        phis (numpy array): angles phis[k, m] between the components of
+            neighbors k and m orthogonal to neighbor j, without any columns
+            if none of the types depends on them.
+        phi2s (numpy array): signed azimuth angles phi2s[k, m] of neighbor m
+            for the prime meridian through neighbor k.
+        flags_yaxis (numpy array): whether no y axis could be constructed
+            from the prime meridian through a neighbor.
+    """
+    ipi = 1 / math.pi
+    piover2 = math.pi / 2.0
+    onethird = 1 / 3
+    twothird = 2 / 3.0
+    fac_bcc = 1 / math.exp(-0.5)
+    asin_onethird = math.asin(1 / 3)
+    n_types = len(type_codes)
+    # Only the last order parameter type receives the South pole
+    # contributions of m, as has always been the case
+    last = n_types - 1
+    south_pole = int(type_codes[last]) in (
+        _TRI_BIPYR,
+        _SQ_BIPYR,
+        _PENT_BIPYR,
+        _HEX_BIPYR,
+        _OCT_MAX,
+        _SQ_PLAN_MAX,
+        _HEX_PLAN_MAX,
+        _SEE_SAW_RECT,
+    )
+    gaussthetak = [0.0] * n_types
+    # Cosine terms of the azimuth angle for the distinct settings
+    cos_aa = [0.0] * len(cos_aa_settings)
+    kc = 0
+    for k in range(len(thetas)):  # From neighbor k, we construct
+        if k == j:  # the prime meridian.
+            continue
+        thetak = float(thetas[k])
+        thetak_pi = thetak * ipi
+        # Contributions to all types for the prime meridian through k
+        qsp_k = [0.0] * n_types
+        norms_k = [0.0] * n_types
+
+        # Contributions of j-i-k angles, where i represents the
+        # central atom and j and k two of the neighbors.
+        for idx in range(n_types):
+            code = int(type_codes[idx])
+            prm = params[idx]
+            if code in (_BENT, _SQ_PYR_LEGACY):
+                tmp = prm[_IGW_TA] * (thetak_pi - prm[_TA])
+                qsp_k[idx] += math.exp(-0.5 * tmp * tmp)
+                norms_k[idx] += 1
+            elif code in (_TRI_PLAN, _TRI_PLAN_MAX, _TET, _TET_MAX):
+                tmp = prm[_IGW_TA] * (thetak_pi - prm[_TA])
+                gaussthetak[idx] = math.exp(-0.5 * tmp * tmp)
+                if code in (_TRI_PLAN_MAX, _TET_MAX):
+                    qsp_k[idx] += gaussthetak[idx]
+                    norms_k[idx] += 1
+            elif code in (_T, _TRI_PYR, _SQ_PYR, _PENT_PYR, _HEX_PYR):
+                tmp = prm[_IGW_EP] * (thetak_pi - 0.5)
+                qsp_k[idx] += math.exp(-0.5 * tmp * tmp)
+                norms_k[idx] += 1
+            elif code in (_SQ_PLAN, _OCT, _OCT_LEGACY, _CUBOCT, _CUBOCT_MAX):
+                if thetak >= prm[_MIN_SPP]:
+                    tmp = prm[_IGW_SPP] * (thetak_pi - 1.0)
+                    qsp_k[idx] += prm[_W_SPP] * math.exp(-0.5 * tmp * tmp)
+                    norms_k[idx] += prm[_W_SPP]
+            elif code in (
+                _SEE_SAW_RECT,
+                _TRI_BIPYR,
+                _SQ_BIPYR,
+                _PENT_BIPYR,
+                _HEX_BIPYR,
+                _OCT_MAX,
+                _SQ_PLAN_MAX,
+                _HEX_PLAN_MAX,
+            ):
+                if thetak < prm[_MIN_SPP]:
+                    if code != _HEX_PLAN_MAX:
+                        tmp = prm[_IGW_EP] * (thetak_pi - 0.5)
+                    else:
+                        tmp = prm[_IGW_TA] * (math.fabs(thetak_pi - 0.5) - prm[_TA])
+                    qsp_k[idx] += math.exp(-0.5 * tmp * tmp)
+                    norms_k[idx] += 1
+            elif code in (_PENT_PLAN, _PENT_PLAN_MAX):
+                tmp = 0.4 if thetak <= prm[_TA] * math.pi else 0.8
+                tmp2 = prm[_IGW_TA] * (thetak_pi - tmp)
+                gaussthetak[idx] = math.exp(-0.5 * tmp2 * tmp2)
+                if code == _PENT_PLAN_MAX:
+                    qsp_k[idx] += gaussthetak[idx]
+                    norms_k[idx] += 1
+            elif code == _BCC and j < k:
+                if thetak >= prm[_MIN_SPP]:
+                    tmp = prm[_IGW_SPP] * (thetak_pi - 1.0)
+                    qsp_k[idx] += prm[_W_SPP] * math.exp(-0.5 * tmp * tmp)
+                    norms_k[idx] += prm[_W_SPP]
+            elif code == _SQ_FACE_CAP_TRIG_PRIS and thetak < prm[_TA3]:
+                tmp = prm[_IGW_TA1] * (thetak_pi - prm[_TA1])
+                qsp_k[idx] += math.exp(-0.5 * tmp * tmp)
+                norms_k[idx] += 1
+
+        for m in range(phis.shape[1]):
+            if m in (j, k) or flags_xaxis[k]:
+                continue
+            thetam = float(thetas[m])
+            thetam_pi = thetam * ipi
+
+            # South pole contributions of m.
+            if south_pole and thetam >= params[last, _MIN_SPP]:
+                tmp = params[last, _IGW_SPP] * (thetam_pi - 1.0)
+                qsp_k[last] += math.exp(-0.5 * tmp * tmp)
+                norms_k[last] += 1
+
+            # Contributions of j-i-m angle and
+            # angles between plane j-i-k and i-m vector.
+            if flags_xaxis[m]:
+                continue
+            phi = float(phis[k, m])
+            phi2 = float(phi2s[k, m])
+            for idx in range(len(cos_aa)):
+                cos_aa[idx] = math.cos(cos_aa_settings[idx, 0] * phi) ** cos_aa_settings[idx, 1]
+            for idx in range(n_types):
+                code = int(type_codes[idx])
+                prm = params[idx]
+                if code in (_TRI_PLAN, _TRI_PLAN_MAX, _TET, _TET_MAX):
+                    tmp = prm[_IGW_TA] * (thetam_pi - prm[_TA])
+                    tmp2 = cos_aa[cos_aa_indices[idx]]
+                    tmp3 = 1 if code in (_TRI_PLAN_MAX, _TET_MAX) else gaussthetak[idx]
+                    qsp_k[idx] += tmp3 * math.exp(-0.5 * tmp * tmp) * tmp2
+                    norms_k[idx] += 1
+                elif code in (_PENT_PLAN, _PENT_PLAN_MAX):
+                    tmp = 0.4 if thetam <= prm[_TA] * math.pi else 0.8
+                    tmp2 = prm[_IGW_TA] * (thetam_pi - tmp)
+                    tmp3 = math.cos(phi)
+                    tmp4 = 1 if code == _PENT_PLAN_MAX else gaussthetak[idx]
+                    qsp_k[idx] += tmp4 * math.exp(-0.5 * tmp2 * tmp2) * tmp3 * tmp3
+                    norms_k[idx] += 1
+                elif code in (_T, _TRI_PYR, _SQ_PYR, _PENT_PYR, _HEX_PYR):
+                    tmp = cos_aa[cos_aa_indices[idx]]
+                    tmp3 = prm[_IGW_EP] * (thetam_pi - 0.5)
+                    qsp_k[idx] += tmp * math.exp(-0.5 * tmp3 * tmp3)
+                    norms_k[idx] += 1
+                elif code in (_SQ_PLAN, _OCT, _OCT_LEGACY):
+                    if thetak < prm[_MIN_SPP] and thetam < prm[_MIN_SPP]:
+                        tmp = cos_aa[cos_aa_indices[idx]]
+                        tmp2 = prm[_IGW_EP] * (thetam_pi - 0.5)
+                        qsp_k[idx] += tmp * math.exp(-0.5 * tmp2 * tmp2)
+                        if code == _OCT_LEGACY:
+                            qsp_k[idx] -= tmp * prm[_P6] * prm[_P7]
+                        norms_k[idx] += 1
+                elif code in (_TRI_BIPYR, _SQ_BIPYR, _PENT_BIPYR, _HEX_BIPYR, _OCT_MAX, _SQ_PLAN_MAX, _HEX_PLAN_MAX):
+                    if thetam < prm[_MIN_SPP] and thetak < prm[_MIN_SPP]:
+                        tmp = cos_aa[cos_aa_indices[idx]]
+                        if code != _HEX_PLAN_MAX:
+                            tmp2 = prm[_IGW_EP] * (thetam_pi - 0.5)
+                        else:
+                            tmp2 = prm[_IGW_TA] * (math.fabs(thetam_pi - 0.5) - prm[_TA])
+                        qsp_k[idx] += tmp * math.exp(-0.5 * tmp2 * tmp2)
+                        norms_k[idx] += 1
+                elif code == _BCC and j < k:
+                    if thetak < prm[_MIN_SPP]:
+                        fac = 1 if thetak > piover2 else -1
+                        tmp = (thetam - piover2) / asin_onethird
+                        qsp_k[idx] += fac * math.cos(3 * phi) * fac_bcc * tmp * math.exp(-0.5 * tmp * tmp)
+                        norms_k[idx] += 1
+                elif code == _SEE_SAW_RECT:
+                    if thetam < prm[_MIN_SPP] and thetak < prm[_MIN_SPP] and phi < 0.75 * math.pi:
+                        tmp = cos_aa[cos_aa_indices[idx]]
+                        tmp2 = prm[_IGW_EP] * (thetam_pi - 0.5)
+                        qsp_k[idx] += tmp * math.exp(-0.5 * tmp2 * tmp2)
+                        norms_k[idx] += 1.0
+                elif code in (_CUBOCT, _CUBOCT_MAX):
+                    if thetam < prm[_MIN_SPP] and prm[_P4] < thetak < prm[_P2]:
+                        if prm[_P4] < thetam < prm[_P2]:
+                            tmp = math.cos(phi)
+                            tmp2 = prm[_P5] * (thetam_pi - 0.5)
+                            qsp_k[idx] += tmp * tmp * math.exp(-0.5 * tmp2 * tmp2)
+                            norms_k[idx] += 1.0
+                        elif thetam < prm[_P4]:
+                            tmp = 0.0556 * (math.cos(phi - piover2) - 0.81649658)
+                            tmp2 = prm[_P6] * (thetam_pi - onethird)
+                            qsp_k[idx] += math.exp(-0.5 * tmp * tmp) * math.exp(-0.5 * tmp2 * tmp2)
+                            norms_k[idx] += 1.0
+                        elif thetam > prm[_P2]:
+                            tmp = 0.0556 * (math.cos(phi - piover2) - 0.81649658)
+                            tmp2 = prm[_P6] * (thetam_pi - twothird)
+                            qsp_k[idx] += math.exp(-0.5 * tmp * tmp) * math.exp(-0.5 * tmp2 * tmp2)
+                            norms_k[idx] += 1.0
+                elif code == _SQ_FACE_CAP_TRIG_PRIS and not flags_yaxis[k] and thetak < prm[_TA3]:
+                    if thetam < prm[_TA3]:
+                        tmp = math.cos(prm[_FAC_AA1] * phi2) ** prm[_EXP_COS_AA1]
+                        tmp2 = prm[_IGW_TA1] * (thetam_pi - prm[_TA1])
+                    else:
+                        tmp = math.cos(prm[_FAC_AA2] * (phi2 + prm[_SHIFT_AA2])) ** prm[_EXP_COS_AA2]
+                        tmp2 = prm[_IGW_TA2] * (thetam_pi - prm[_TA2])
+                    qsp_k[idx] += tmp * math.exp(-0.5 * tmp2 * tmp2)
+                    norms_k[idx] += 1
+
+        for idx in range(n_types):
+            qsp_theta[idx, kc] = qsp_k[idx]
+            norms[idx, kc] = norms_k[idx]
+        kc += 1
+
+
 class LocalStructOrderParams:
     """
     This class permits the calculation of various types of local
@@ -2161,6 +3215,46 @@ class LocalStructOrderParams:
         "sq_face_cap_trig_pris",
     )
 
+    # Types of the order parameters that require the respective calculations
+    __geomops_types = frozenset(
+        (
+            "tet",
+            "oct",
+            "bcc",
+            "sq_pyr",
+            "sq_pyr_legacy",
+            "tri_bipyr",
+            "sq_bipyr",
+            "oct_legacy",
+            "tri_plan",
+            "sq_plan",
+            "pent_plan",
+            "tri_pyr",
+            "pent_pyr",
+            "hex_pyr",
+            "pent_bipyr",
+            "hex_bipyr",
+            "T",
+            "cuboct",
+            "oct_max",
+            "tet_max",
+            "tri_plan_max",
+            "sq_plan_max",
+            "pent_plan_max",
+            "cuboct_max",
+            "bent",
+            "see_saw_rect",
+            "hex_plan_max",
+            "sq_face_cap_trig_pris",
+        )
+    )
+    # Types of __geomops_types that only depend on the polar angles
+    __geomops_polar_types = frozenset(("bent", "sq_pyr_legacy"))
+    __geomops2_types = frozenset(("reg_tri", "sq"))
+    __boops_types = frozenset(("q2", "q4", "q6"))
+    # Types evaluated for many sites at once by get_order_parameters_batch
+    __batch_types = frozenset(("cn", "sgl_bd", "q2", "q4", "q6"))
+
     def __init__(self, types, parameters=None, cutoff=-10.0) -> None:
         """
         Args:
@@ -2271,58 +3365,47 @@ class LocalStructOrderParams:
 
         self._comp_azi = False
         self._params = []
+        default_op_params = _load_op_params()
         for idx, typ in enumerate(self._types):
             dct = deepcopy(default_op_params[typ]) if default_op_params[typ] is not None else None
             if parameters is None or parameters[idx] is None:
                 self._params.append(dct)
             else:
                 self._params.append(deepcopy(parameters[idx]))
+        for typ, dct in zip(self._types, self._params):
+            for key in _GEOMOP_REQUIRED_KEYS.get(_GEOMOP_TYPE_CODES.get(typ, -1), ()):
+                if dct is None or key not in dct:
+                    raise ValueError(f"Missing parameter {key!r} for order parameter type ({typ})!")
+        self._geomop_codes = np.array([_GEOMOP_TYPE_CODES.get(typ, -1) for typ in self._types], dtype=int)
+        self._geomop_params = np.array(
+            [[np.nan if dct is None else dct.get(key, np.nan) for key in _GEOMOP_PARAM_KEYS] for dct in self._params],
+            dtype=float,
+        ).reshape(len(self._types), len(_GEOMOP_PARAM_KEYS))
+        # Distinct cosine terms of the azimuth angle shared by several types
+        cos_aa_settings: dict[tuple[float, float], int] = {}
+        self._cos_aa_indices = np.full(len(self._types), -1, dtype=int)
+        for idx, prm in enumerate(self._geomop_params):
+            if not np.isnan(prm[[_FAC_AA, _EXP_COS_AA]]).any():
+                setting = (float(prm[_FAC_AA]), float(prm[_EXP_COS_AA]))
+                self._cos_aa_indices[idx] = cos_aa_settings.setdefault(setting, len(cos_aa_settings))
+        self._cos_aa_settings = np.array(list(cos_aa_settings), dtype=float).reshape(-1, 2)
 
         self._computerijs = self._computerjks = self._geomops = False
-        self._geomops2 = self._boops = False
+        self._comp_phis = self._geomops2 = self._boops = False
         self._max_trig_order = -1
 
         # Add here any additional flags to be used during calculation.
         if "sgl_bd" in self._types:
             self._computerijs = True
-        if not set(self._types).isdisjoint(
-            [
-                "tet",
-                "oct",
-                "bcc",
-                "sq_pyr",
-                "sq_pyr_legacy",
-                "tri_bipyr",
-                "sq_bipyr",
-                "oct_legacy",
-                "tri_plan",
-                "sq_plan",
-                "pent_plan",
-                "tri_pyr",
-                "pent_pyr",
-                "hex_pyr",
-                "pent_bipyr",
-                "hex_bipyr",
-                "T",
-                "cuboct",
-                "oct_max",
-                "tet_max",
-                "tri_plan_max",
-                "sq_plan_max",
-                "pent_plan_max",
-                "cuboct_max",
-                "bent",
-                "see_saw_rect",
-                "hex_plan_max",
-                "sq_face_cap_trig_pris",
-            ]
-        ):
+        if not self.__geomops_types.isdisjoint(self._types):
             self._computerijs = self._geomops = True
+        if not (self.__geomops_types - self.__geomops_polar_types).isdisjoint(self._types):
+            self._comp_phis = True
         if "sq_face_cap_trig_pris" in self._types:
             self._comp_azi = True
-        if not set(self._types).isdisjoint(["reg_tri", "sq"]):
+        if not self.__geomops2_types.isdisjoint(self._types):
             self._computerijs = self._computerjks = self._geomops2 = True
-        if not set(self._types).isdisjoint(["q2", "q4", "q6"]):
+        if not self.__boops_types.isdisjoint(self._types):
             self._computerijs = self._boops = True
         if "q2" in self._types:
             self._max_trig_order = 2
@@ -2343,10 +3426,10 @@ class LocalStructOrderParams:
 
         # Further variable definitions.
         self._last_nneigh = -1
-        self._pow_sin_t: dict[int, list[float]] = {}
-        self._pow_cos_t: dict[int, list[float]] = {}
-        self._sin_n_p: dict[int, list[float]] = {}
-        self._cos_n_p: dict[int, list[float]] = {}
+        self._pow_sin_t: dict[int, np.ndarray] = {}
+        self._pow_cos_t: dict[int, np.ndarray] = {}
+        self._sin_n_p = np.empty((0, 0))
+        self._cos_n_p = np.empty((0, 0))
 
     @property
     def num_ops(self) -> int:
@@ -2354,11 +3437,11 @@ class LocalStructOrderParams:
         return len(self._types)
 
     @property
-    def last_nneigh(self):
+    def last_nneigh(self) -> int:
         """Number of neighbors encountered during the most recent order parameter calculation.
         A value of -1 indicates that no such calculation has yet been performed for this instance.
         """
-        return len(self._last_nneigh)
+        return self._last_nneigh
 
     def compute_trigonometric_terms(self, thetas, phis):
         """Compute trigonometric terms that are required to calculate
@@ -2382,19 +3465,33 @@ class LocalStructOrderParams:
 
         self._pow_sin_t.clear()
         self._pow_cos_t.clear()
-        self._sin_n_p.clear()
-        self._cos_n_p.clear()
-
-        self._pow_sin_t[1] = [math.sin(float(t)) for t in thetas]
-        self._pow_cos_t[1] = [math.cos(float(t)) for t in thetas]
-        self._sin_n_p[1] = [math.sin(float(p)) for p in phis]
-        self._cos_n_p[1] = [math.cos(float(p)) for p in phis]
 
+        thetas = np.asarray(thetas, dtype=float)
+        phis = np.asarray(phis, dtype=float)
+        self._pow_sin_t[1] = np.sin(thetas)
+        self._pow_cos_t[1] = np.cos(thetas)
         for idx in range(2, self._max_trig_order + 1):
-            self._pow_sin_t[idx] = [e[0] * e[1] for e in zip(self._pow_sin_t[idx - 1], self._pow_sin_t[1])]
-            self._pow_cos_t[idx] = [e[0] * e[1] for e in zip(self._pow_cos_t[idx - 1], self._pow_cos_t[1])]
-            self._sin_n_p[idx] = [math.sin(float(idx) * float(p)) for p in phis]
-            self._cos_n_p[idx] = [math.cos(float(idx) * float(p)) for p in phis]
+            self._pow_sin_t[idx] = self._pow_sin_t[idx - 1] * self._pow_sin_t[1]
+            self._pow_cos_t[idx] = self._pow_cos_t[idx - 1] * self._pow_cos_t[1]
+
+        # The multiples of the azimuth angles of all orders at once, so that
+        # row m of _sin_n_p and _cos_n_p holds sin(m * phi) and cos(m * phi)
+        n_phis = np.outer(np.arange(max(self._max_trig_order, 1) + 1), phis)
+        self._sin_n_p = np.sin(n_phis)
+        self._cos_n_p = np.cos(n_phis)
+
+    def _get_unit_vector_components(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Get the Cartesian components of the unit vectors pointing along the
+        angles of the most recent compute_trigonometric_terms call.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: x, y and z components.
+        """
+        return (
+            self._pow_sin_t[1] * self._cos_n_p[1],
+            self._pow_sin_t[1] * self._sin_n_p[1],
+            self._pow_cos_t[1],
+        )
 
     def get_q2(self, thetas=None, phis=None):
         """
@@ -2414,52 +3511,8 @@ class LocalStructOrderParams:
         """
         if thetas is not None and phis is not None:
             self.compute_trigonometric_terms(thetas, phis)
-        n_nn = len(self._pow_sin_t[1])
-        n_nn_range = range(n_nn)
-
-        sqrt_15_2pi = math.sqrt(15 / (2 * math.pi))
-        sqrt_5_pi = math.sqrt(5 / math.pi)
-
-        pre_y_2_2 = [0.25 * sqrt_15_2pi * val for val in self._pow_sin_t[2]]
-        pre_y_2_1 = [0.5 * sqrt_15_2pi * val[0] * val[1] for val in zip(self._pow_sin_t[1], self._pow_cos_t[1])]
-
-        acc = 0.0
-
-        # Y_2_-2
-        real = imag = 0.0
-        for idx in n_nn_range:
-            real += pre_y_2_2[idx] * self._cos_n_p[2][idx]
-            imag -= pre_y_2_2[idx] * self._sin_n_p[2][idx]
-        acc += real * real + imag * imag
-
-        # Y_2_-1
-        real = imag = 0.0
-        for idx in n_nn_range:
-            real += pre_y_2_1[idx] * self._cos_n_p[1][idx]
-            imag -= pre_y_2_1[idx] * self._sin_n_p[1][idx]
-        acc += real * real + imag * imag
-
-        # Y_2_0
-        real = imag = 0.0
-        for idx in n_nn_range:
-            real += 0.25 * sqrt_5_pi * (3 * self._pow_cos_t[2][idx] - 1.0)
-        acc += real * real
-
-        # Y_2_1
-        real = imag = 0.0
-        for idx in n_nn_range:
-            real -= pre_y_2_1[idx] * self._cos_n_p[1][idx]
-            imag -= pre_y_2_1[idx] * self._sin_n_p[1][idx]
-        acc += real * real + imag * imag
-
-        # Y_2_2
-        real = imag = 0.0
-        for idx in n_nn_range:
-            real += pre_y_2_2[idx] * self._cos_n_p[2][idx]
-            imag += pre_y_2_2[idx] * self._sin_n_p[2][idx]
-        acc += real * real + imag * imag
-
-        return math.sqrt(4 * math.pi * acc / (5 * float(n_nn * n_nn)))
+
+        return _get_boop(*self._get_unit_vector_components(), 2)
 
     def get_q4(self, thetas=None, phis=None):
         """
@@ -2479,93 +3532,8 @@ class LocalStructOrderParams:
         """
         if thetas is not None and phis is not None:
             self.compute_trigonometric_terms(thetas, phis)
-        n_nn = len(self._pow_sin_t[1])
-        n_nn_range = range(n_nn)
-
-        i16_3 = 3 / 16.0
-        i8_3 = 3 / 8.0
-
-        sqrt_35_pi = math.sqrt(35 / math.pi)
-        sqrt_35_2pi = math.sqrt(35 / (2 * math.pi))
-        sqrt_5_pi = math.sqrt(5 / math.pi)
-        sqrt_5_2pi = math.sqrt(5 / (2 * math.pi))
-        sqrt_1_pi = math.sqrt(1 / math.pi)
-
-        pre_y_4_4 = [i16_3 * sqrt_35_2pi * val for val in self._pow_sin_t[4]]
-        pre_y_4_3 = [i8_3 * sqrt_35_pi * val[0] * val[1] for val in zip(self._pow_sin_t[3], self._pow_cos_t[1])]
-        pre_y_4_2 = [
-            i8_3 * sqrt_5_2pi * val[0] * (7 * val[1] - 1.0) for val in zip(self._pow_sin_t[2], self._pow_cos_t[2])
-        ]
-        pre_y_4_1 = [
-            i8_3 * sqrt_5_pi * val[0] * (7 * val[1] - 3 * val[2])
-            for val in zip(self._pow_sin_t[1], self._pow_cos_t[3], self._pow_cos_t[1])
-        ]
 
-        acc = 0.0
-
-        # Y_4_-4
-        real = imag = 0.0
-        for idx in n_nn_range:
-            real += pre_y_4_4[idx] * self._cos_n_p[4][idx]
-            imag -= pre_y_4_4[idx] * self._sin_n_p[4][idx]
-        acc += real * real + imag * imag
-
-        # Y_4_-3
-        real = imag = 0.0
-        for idx in n_nn_range:
-            real += pre_y_4_3[idx] * self._cos_n_p[3][idx]
-            imag -= pre_y_4_3[idx] * self._sin_n_p[3][idx]
-        acc += real * real + imag * imag
-
-        # Y_4_-2
-        real = imag = 0.0
-        for idx in n_nn_range:
-            real += pre_y_4_2[idx] * self._cos_n_p[2][idx]
-            imag -= pre_y_4_2[idx] * self._sin_n_p[2][idx]
-        acc += real * real + imag * imag
-
-        # Y_4_-1
-        real = imag = 0.0
-        for idx in n_nn_range:
-            real += pre_y_4_1[idx] * self._cos_n_p[1][idx]
-            imag -= pre_y_4_1[idx] * self._sin_n_p[1][idx]
-        acc += real * real + imag * imag
-
-        # Y_4_0
-        real = imag = 0.0
-        for idx in n_nn_range:
-            real += i16_3 * sqrt_1_pi * (35 * self._pow_cos_t[4][idx] - 30 * self._pow_cos_t[2][idx] + 3.0)
-        acc += real * real
-
-        # Y_4_1
-        real = imag = 0.0
-        for idx in n_nn_range:
-            real -= pre_y_4_1[idx] * self._cos_n_p[1][idx]
-            imag -= pre_y_4_1[idx] * self._sin_n_p[1][idx]
-        acc += real * real + imag * imag
-
-        # Y_4_2
-        real = imag = 0.0
-        for idx in n_nn_range:
-            real += pre_y_4_2[idx] * self._cos_n_p[2][idx]
-            imag += pre_y_4_2[idx] * self._sin_n_p[2][idx]
-        acc += real * real + imag * imag
-
-        # Y_4_3
-        real = imag = 0.0
-        for idx in n_nn_range:
-            real -= pre_y_4_3[idx] * self._cos_n_p[3][idx]
-            imag -= pre_y_4_3[idx] * self._sin_n_p[3][idx]
-        acc += real * real + imag * imag
-
-        # Y_4_4
-        real = imag = 0.0
-        for idx in n_nn_range:
-            real += pre_y_4_4[idx] * self._cos_n_p[4][idx]
-            imag += pre_y_4_4[idx] * self._sin_n_p[4][idx]
-        acc += real * real + imag * imag
-
-        return math.sqrt(4 * math.pi * acc / (9 * float(n_nn * n_nn)))
+        return _get_boop(*self._get_unit_vector_components(), 4)
 
     def get_q6(self, thetas=None, phis=None):
         """
@@ -2585,154 +3553,8 @@ class LocalStructOrderParams:
         """
         if thetas is not None and phis is not None:
             self.compute_trigonometric_terms(thetas, phis)
-        n_nn = len(self._pow_sin_t[1])
-        n_nn_range = range(n_nn)
-
-        i64 = 1 / 64.0
-        i32 = 1 / 32.0
-        i32_3 = 3 / 32.0
-        i16 = 1 / 16.0
-
-        sqrt_3003_pi = math.sqrt(3003 / math.pi)
-        sqrt_1001_pi = math.sqrt(1001 / math.pi)
-        sqrt_91_2pi = math.sqrt(91 / (2 * math.pi))
-        sqrt_1365_pi = math.sqrt(1365 / math.pi)
-        sqrt_273_2pi = math.sqrt(273 / (2 * math.pi))
-        sqrt_13_pi = math.sqrt(13 / math.pi)
-
-        pre_y_6_6 = [i64 * sqrt_3003_pi * val for val in self._pow_sin_t[6]]
-        pre_y_6_5 = [i32_3 * sqrt_1001_pi * val[0] * val[1] for val in zip(self._pow_sin_t[5], self._pow_cos_t[1])]
-        pre_y_6_4 = [
-            i32_3 * sqrt_91_2pi * val[0] * (11 * val[1] - 1.0) for val in zip(self._pow_sin_t[4], self._pow_cos_t[2])
-        ]
-        pre_y_6_3 = [
-            i32 * sqrt_1365_pi * val[0] * (11 * val[1] - 3 * val[2])
-            for val in zip(self._pow_sin_t[3], self._pow_cos_t[3], self._pow_cos_t[1])
-        ]
-        pre_y_6_2 = [
-            i64 * sqrt_1365_pi * val[0] * (33 * val[1] - 18 * val[2] + 1.0)
-            for val in zip(self._pow_sin_t[2], self._pow_cos_t[4], self._pow_cos_t[2])
-        ]
-        pre_y_6_1 = [
-            i16 * sqrt_273_2pi * val[0] * (33 * val[1] - 30 * val[2] + 5 * val[3])
-            for val in zip(
-                self._pow_sin_t[1],
-                self._pow_cos_t[5],
-                self._pow_cos_t[3],
-                self._pow_cos_t[1],
-            )
-        ]
 
-        acc = 0.0
-
-        # Y_6_-6
-        real = 0.0
-        imag = 0.0
-        for idx in n_nn_range:
-            real += pre_y_6_6[idx] * self._cos_n_p[6][idx]  # cos(x) = cos(-x)
-            imag -= pre_y_6_6[idx] * self._sin_n_p[6][idx]  # sin(x) = -sin(-x)
-        acc += real * real + imag * imag
-
-        # Y_6_-5
-        real = 0.0
-        imag = 0.0
-        for idx in n_nn_range:
-            real += pre_y_6_5[idx] * self._cos_n_p[5][idx]
-            imag -= pre_y_6_5[idx] * self._sin_n_p[5][idx]
-        acc += real * real + imag * imag
-
-        # Y_6_-4
-        real = 0.0
-        imag = 0.0
-        for idx in n_nn_range:
-            real += pre_y_6_4[idx] * self._cos_n_p[4][idx]
-            imag -= pre_y_6_4[idx] * self._sin_n_p[4][idx]
-        acc += real * real + imag * imag
-
-        # Y_6_-3
-        real = 0.0
-        imag = 0.0
-        for idx in n_nn_range:
-            real += pre_y_6_3[idx] * self._cos_n_p[3][idx]
-            imag -= pre_y_6_3[idx] * self._sin_n_p[3][idx]
-        acc += real * real + imag * imag
-
-        # Y_6_-2
-        real = 0.0
-        imag = 0.0
-        for idx in n_nn_range:
-            real += pre_y_6_2[idx] * self._cos_n_p[2][idx]
-            imag -= pre_y_6_2[idx] * self._sin_n_p[2][idx]
-        acc += real * real + imag * imag
-
-        # Y_6_-1
-        real = 0.0
-        imag = 0.0
-        for idx in n_nn_range:
-            real += pre_y_6_1[idx] * self._cos_n_p[1][idx]
-            imag -= pre_y_6_1[idx] * self._sin_n_p[1][idx]
-        acc += real * real + imag * imag
-
-        # Y_6_0
-        real = 0.0
-        imag = 0.0
-        for idx in n_nn_range:
-            real += (
-                i32
-                * sqrt_13_pi
-                * (231 * self._pow_cos_t[6][idx] - 315 * self._pow_cos_t[4][idx] + 105 * self._pow_cos_t[2][idx] - 5.0)
-            )
-        acc += real * real
-
-        # Y_6_1
-        real = 0.0
-        imag = 0.0
-        for idx in n_nn_range:
-            real -= pre_y_6_1[idx] * self._cos_n_p[1][idx]
-            imag -= pre_y_6_1[idx] * self._sin_n_p[1][idx]
-        acc += real * real + imag * imag
-
-        # Y_6_2
-        real = 0.0
-        imag = 0.0
-        for idx in n_nn_range:
-            real += pre_y_6_2[idx] * self._cos_n_p[2][idx]
-            imag += pre_y_6_2[idx] * self._sin_n_p[2][idx]
-        acc += real * real + imag * imag
-
-        # Y_6_3
-        real = 0.0
-        imag = 0.0
-        for idx in n_nn_range:
-            real -= pre_y_6_3[idx] * self._cos_n_p[3][idx]
-            imag -= pre_y_6_3[idx] * self._sin_n_p[3][idx]
-        acc += real * real + imag * imag
-
-        # Y_6_4
-        real = 0.0
-        imag = 0.0
-        for idx in n_nn_range:
-            real += pre_y_6_4[idx] * self._cos_n_p[4][idx]
-            imag += pre_y_6_4[idx] * self._sin_n_p[4][idx]
-        acc += real * real + imag * imag
-
-        # Y_6_5
-        real = 0.0
-        imag = 0.0
-        for idx in n_nn_range:
-            real -= pre_y_6_5[idx] * self._cos_n_p[5][idx]
-            imag -= pre_y_6_5[idx] * self._sin_n_p[5][idx]
-        acc += real * real + imag * imag
-
-        # Y_6_6
-        real = 0.0
-        imag = 0.0
-        for idx in n_nn_range:
-            real += pre_y_6_6[idx] * self._cos_n_p[6][idx]
-            imag += pre_y_6_6[idx] * self._sin_n_p[6][idx]
-        acc += real * real + imag * imag
-
-        return math.sqrt(4 * math.pi * acc / (13 * float(n_nn * n_nn)))
+        return _get_boop(*self._get_unit_vector_components(), 6)
 
     def get_type(self, index):
         """Get type of order parameter at the index provided and
@@ -2830,10 +3652,8 @@ class LocalStructOrderParams:
         if tol < 0.0:
             raise ValueError("Negative tolerance for weighted solid angle!")
 
-        left_of_unity = 1 - 1.0e-12
         # The following threshold has to be adapted to non-Angstrom units.
         very_small = 1.0e-12
-        fac_bcc = 1 / math.exp(-0.5)
 
         # Find central site and its neighbors.
         # Note that we adopt the same way of accessing sites here as in
@@ -2860,33 +3680,20 @@ class LocalStructOrderParams:
         self._last_nneigh = n_neighbors
 
         # Prepare angle calculations, if applicable.
-        rij: list[np.ndarray] = []
-        rjk: list[list[np.ndarray]] = []
-        rij_norm: list[list[float]] = []
-        rjknorm: list[list[np.ndarray]] = []
-        dist: list[float] = []
-        distjk_unique: list[float] = []
-        distjk: list[list[float]] = []
+        neighcoords = np.array([neigh.coords for neigh in neighsites], dtype=float).reshape(-1, 3)
+        rij_norm = np.empty((0, 3))
+        dist = np.empty(0)
+        distjk_unique = np.empty(0)
         centvec = centsite.coords
         if self._computerijs:
-            for j, neigh in enumerate(neighsites):
-                rij.append(neigh.coords - centvec)
-                dist.append(float(np.linalg.norm(rij[j])))
-                rij_norm.append(rij[j] / dist[j])
+            rij = neighcoords - centvec
+            dist = np.sqrt(np.einsum("ij,ij->i", rij, rij))
+            rij_norm = rij / dist[:, None]
         if self._computerjks:
-            for j, neigh in enumerate(neighsites):
-                rjk.append([])
-                rjknorm.append([])
-                distjk.append([])
-                kk = 0
-                for k, neigh_2 in enumerate(neighsites):
-                    if j != k:
-                        rjk[j].append(neigh_2.coords - neigh.coords)
-                        distjk[j].append(float(np.linalg.norm(rjk[j][kk])))
-                        if k > j:
-                            distjk_unique.append(distjk[j][kk])
-                        rjknorm[j].append(rjk[j][kk] / distjk[j][kk])
-                        kk += 1
+            # Distances between all pairs of neighbors j < k
+            j_indices, k_indices = np.triu_indices(n_neighbors, k=1)
+            rjk = neighcoords[k_indices] - neighcoords[j_indices]
+            distjk_unique = np.sqrt(np.einsum("ij,ij->i", rjk, rjk))
         # Initialize OP list and, then, calculate OPs.
         ops: list[float | None] = [0.0 for t in self._types]
         # norms = [[[] for j in range(nneigh)] for t in self._types]
@@ -2906,335 +3713,63 @@ class LocalStructOrderParams:
         # Then, bond orientational OPs based on spherical harmonics
         # according to Steinhardt et al., Phys. Rev. B, 28, 784-805, 1983.
         if self._boops:
-            thetas = []
-            phis = []
-            for vec in rij_norm:
-                # z is North pole --> theta between vec and (0, 0, 1)^T.
-                # Because vec is normalized, dot product is simply vec[2].
-                thetas.append(math.acos(max(-1.0, min(vec[2], 1.0))))
-                tmpphi = 0.0
-
-                # Compute phi only if it is not (almost) perfectly
-                # aligned with z-axis.
-                if -left_of_unity < vec[2] < left_of_unity:
-                    # x is prime meridian --> phi between projection of vec
-                    # into x-y plane and (1, 0, 0)^T
-                    tmpphi = math.acos(
-                        max(
-                            -1.0,
-                            min(vec[0] / (math.sqrt(vec[0] * vec[0] + vec[1] * vec[1])), 1.0),
-                        )
-                    )
-                    if vec[1] < 0.0:
-                        tmpphi = -tmpphi
-                phis.append(tmpphi)
-
+            # The spherical harmonics are evaluated directly from the
+            # Cartesian components of the normalized bond vectors.
             # Note that None flags that we have too few neighbors
             # for calculating BOOPS.
+            x, y, z = np.array(rij_norm, dtype=float).reshape(-1, 3).T.copy()
             for idx, typ in enumerate(self._types):
-                if typ == "q2":
-                    ops[idx] = self.get_q2(thetas, phis) if len(thetas) > 0 else None
-                elif typ == "q4":
-                    ops[idx] = self.get_q4(thetas, phis) if len(thetas) > 0 else None
-                elif typ == "q6":
-                    ops[idx] = self.get_q6(thetas, phis) if len(thetas) > 0 else None
+                if typ in ("q2", "q4", "q6"):
+                    ops[idx] = _get_boop(x, y, z, int(typ[1])) if n_neighbors > 0 else None
 
         # Then, deal with the Peters-style OPs that are tailor-made
         # to recognize common structural motifs
         # (Peters, J. Chem. Phys., 131, 244103, 2009;
         #  Zimmermann et al., J. Am. Chem. Soc., under revision, 2015).
         if self._geomops:
-            gaussthetak: list[float] = [0 for _t in self._types]  # not used by all OPs
-            qsp_theta: list[list[list]] = [[[] for _j in range(n_neighbors)] for _t in self._types]
-            norms: list[list[list]] = [[[] for _j in range(n_neighbors)] for _t in self._types]
-            ipi = 1 / math.pi
-            piover2 = math.pi / 2.0
-            onethird = 1 / 3
-            twothird = 2 / 3.0
+            qsp_theta = np.zeros((len(self._types), n_neighbors, max(n_neighbors - 1, 0)))
+            norms = np.zeros_like(qsp_theta)
             for j in range(n_neighbors):  # Neighbor j is put to the North pole.
                 zaxis = rij_norm[j]
-                kc = 0
-                idx = 0
-                for k in range(n_neighbors):  # From neighbor k, we construct
-                    if j != k:  # the prime meridian.
-                        for idx in range(len(self._types)):
-                            qsp_theta[idx][j].append(0.0)
-                            norms[idx][j].append(0)
-                        tmp = max(-1.0, min(np.inner(zaxis, rij_norm[k]), 1.0))
-                        thetak = math.acos(tmp)
-                        xaxis = gramschmidt(rij_norm[k], zaxis)
-                        if np.linalg.norm(xaxis) < very_small:
-                            flag_xaxis = True
-                        else:
-                            xaxis = xaxis / np.linalg.norm(xaxis)
-                            flag_xaxis = False
-
-                        if self._comp_azi:
-                            flag_yaxis = True
-                            yaxis = np.cross(zaxis, xaxis)
-                            if np.linalg.norm(yaxis) > very_small:
-                                yaxis = yaxis / np.linalg.norm(yaxis)
-                                flag_yaxis = False
-                        else:
-                            yaxis = None
-                            flag_yaxis = False
-
-                        # Contributions of j-i-k angles, where i represents the
-                        # central atom and j and k two of the neighbors.
-                        for idx, typ in enumerate(self._types):
-                            if typ in {"bent", "sq_pyr_legacy"}:
-                                tmp = self._params[idx]["IGW_TA"] * (thetak * ipi - self._params[idx]["TA"])
-                                qsp_theta[idx][j][kc] += math.exp(-0.5 * tmp * tmp)
-                                norms[idx][j][kc] += 1
-                            elif typ in {"tri_plan", "tri_plan_max", "tet", "tet_max"}:
-                                tmp = self._params[idx]["IGW_TA"] * (thetak * ipi - self._params[idx]["TA"])
-                                gaussthetak[idx] = math.exp(-0.5 * tmp * tmp)
-                                if typ in ["tri_plan_max", "tet_max"]:
-                                    qsp_theta[idx][j][kc] += gaussthetak[idx]
-                                    norms[idx][j][kc] += 1
-                            elif typ in {"T", "tri_pyr", "sq_pyr", "pent_pyr", "hex_pyr"}:
-                                tmp = self._params[idx]["IGW_EP"] * (thetak * ipi - 0.5)
-                                qsp_theta[idx][j][kc] += math.exp(-0.5 * tmp * tmp)
-                                norms[idx][j][kc] += 1
-                            elif typ in {
-                                "sq_plan",
-                                "oct",
-                                "oct_legacy",
-                                "cuboct",
-                                "cuboct_max",
-                            }:
-                                if thetak >= self._params[idx]["min_SPP"]:
-                                    tmp = self._params[idx]["IGW_SPP"] * (thetak * ipi - 1.0)
-                                    qsp_theta[idx][j][kc] += self._params[idx]["w_SPP"] * math.exp(-0.5 * tmp * tmp)
-                                    norms[idx][j][kc] += self._params[idx]["w_SPP"]
-                            elif typ in {
-                                "see_saw_rect",
-                                "tri_bipyr",
-                                "sq_bipyr",
-                                "pent_bipyr",
-                                "hex_bipyr",
-                                "oct_max",
-                                "sq_plan_max",
-                                "hex_plan_max",
-                            }:
-                                if thetak < self._params[idx]["min_SPP"]:
-                                    tmp = (
-                                        self._params[idx]["IGW_EP"] * (thetak * ipi - 0.5)
-                                        if typ != "hex_plan_max"
-                                        else self._params[idx]["IGW_TA"]
-                                        * (math.fabs(thetak * ipi - 0.5) - self._params[idx]["TA"])
-                                    )
-                                    qsp_theta[idx][j][kc] += math.exp(-0.5 * tmp * tmp)
-                                    norms[idx][j][kc] += 1
-                            elif typ in ["pent_plan", "pent_plan_max"]:
-                                tmp = 0.4 if thetak <= self._params[idx]["TA"] * math.pi else 0.8
-                                tmp2 = self._params[idx]["IGW_TA"] * (thetak * ipi - tmp)
-                                gaussthetak[idx] = math.exp(-0.5 * tmp2 * tmp2)
-                                if typ == "pent_plan_max":
-                                    qsp_theta[idx][j][kc] += gaussthetak[idx]
-                                    norms[idx][j][kc] += 1
-                            elif typ == "bcc" and j < k:
-                                if thetak >= self._params[idx]["min_SPP"]:
-                                    tmp = self._params[idx]["IGW_SPP"] * (thetak * ipi - 1.0)
-                                    qsp_theta[idx][j][kc] += self._params[idx]["w_SPP"] * math.exp(-0.5 * tmp * tmp)
-                                    norms[idx][j][kc] += self._params[idx]["w_SPP"]
-                            elif typ == "sq_face_cap_trig_pris" and thetak < self._params[idx]["TA3"]:
-                                tmp = self._params[idx]["IGW_TA1"] * (thetak * ipi - self._params[idx]["TA1"])
-                                qsp_theta[idx][j][kc] += math.exp(-0.5 * tmp * tmp)
-                                norms[idx][j][kc] += 1
-
-                        for m in range(n_neighbors):
-                            if (m != j) and (m != k) and (not flag_xaxis):
-                                tmp = max(-1.0, min(np.inner(zaxis, rij_norm[m]), 1.0))
-                                thetam = math.acos(tmp)
-                                x_two_axis_tmp = gramschmidt(rij_norm[m], zaxis)
-                                norm = np.linalg.norm(x_two_axis_tmp)
-                                phi2 = 0.0
-                                if norm < very_small:
-                                    flag_xtwoaxis = True
-                                    phi = 0.0
-                                else:
-                                    xtwoaxis = x_two_axis_tmp / norm
-                                    phi = math.acos(max(-1.0, min(np.inner(xtwoaxis, xaxis), 1.0)))
-                                    flag_xtwoaxis = False
-                                    if self._comp_azi:
-                                        phi2 = math.atan2(
-                                            np.dot(xtwoaxis, yaxis),
-                                            np.dot(xtwoaxis, xaxis),
-                                        )
-                                # South pole contributions of m.
-                                if (
-                                    typ
-                                    in {
-                                        "tri_bipyr",
-                                        "sq_bipyr",
-                                        "pent_bipyr",
-                                        "hex_bipyr",
-                                        "oct_max",
-                                        "sq_plan_max",
-                                        "hex_plan_max",
-                                        "see_saw_rect",
-                                    }
-                                    and thetam >= self._params[idx]["min_SPP"]
-                                ):
-                                    tmp = self._params[idx]["IGW_SPP"] * (thetam * ipi - 1.0)
-                                    qsp_theta[idx][j][kc] += math.exp(-0.5 * tmp * tmp)
-                                    norms[idx][j][kc] += 1
-
-                                # Contributions of j-i-m angle and
-                                # angles between plane j-i-k and i-m vector.
-                                if not flag_xaxis and not flag_xtwoaxis:
-                                    for idx, typ in enumerate(self._types):
-                                        if typ in {
-                                            "tri_plan",
-                                            "tri_plan_max",
-                                            "tet",
-                                            "tet_max",
-                                        }:
-                                            tmp = self._params[idx]["IGW_TA"] * (thetam * ipi - self._params[idx]["TA"])
-                                            tmp2 = (
-                                                math.cos(self._params[idx]["fac_AA"] * phi)
-                                                ** self._params[idx]["exp_cos_AA"]
-                                            )
-                                            tmp3 = 1 if typ in ["tri_plan_max", "tet_max"] else gaussthetak[idx]
-                                            qsp_theta[idx][j][kc] += tmp3 * math.exp(-0.5 * tmp * tmp) * tmp2
-                                            norms[idx][j][kc] += 1
-                                        elif typ in ["pent_plan", "pent_plan_max"]:
-                                            tmp = 0.4 if thetam <= self._params[idx]["TA"] * math.pi else 0.8
-                                            tmp2 = self._params[idx]["IGW_TA"] * (thetam * ipi - tmp)
-                                            tmp3 = math.cos(phi)
-                                            tmp4 = 1 if typ == "pent_plan_max" else gaussthetak[idx]
-                                            qsp_theta[idx][j][kc] += tmp4 * math.exp(-0.5 * tmp2 * tmp2) * tmp3 * tmp3
-                                            norms[idx][j][kc] += 1
-                                        elif typ in {
-                                            "T",
-                                            "tri_pyr",
-                                            "sq_pyr",
-                                            "pent_pyr",
-                                            "hex_pyr",
-                                        }:
-                                            tmp = (
-                                                math.cos(self._params[idx]["fac_AA"] * phi)
-                                                ** self._params[idx]["exp_cos_AA"]
-                                            )
-                                            tmp3 = self._params[idx]["IGW_EP"] * (thetam * ipi - 0.5)
-                                            qsp_theta[idx][j][kc] += tmp * math.exp(-0.5 * tmp3 * tmp3)
-                                            norms[idx][j][kc] += 1
-                                        elif typ in ["sq_plan", "oct", "oct_legacy"]:
-                                            if (
-                                                thetak < self._params[idx]["min_SPP"]
-                                                and thetam < self._params[idx]["min_SPP"]
-                                            ):
-                                                tmp = (
-                                                    math.cos(self._params[idx]["fac_AA"] * phi)
-                                                    ** self._params[idx]["exp_cos_AA"]
-                                                )
-                                                tmp2 = self._params[idx]["IGW_EP"] * (thetam * ipi - 0.5)
-                                                qsp_theta[idx][j][kc] += tmp * math.exp(-0.5 * tmp2 * tmp2)
-                                                if typ == "oct_legacy":
-                                                    qsp_theta[idx][j][kc] -= (
-                                                        tmp * self._params[idx][6] * self._params[idx][7]
-                                                    )
-                                                norms[idx][j][kc] += 1
-                                        elif typ in {
-                                            "tri_bipyr",
-                                            "sq_bipyr",
-                                            "pent_bipyr",
-                                            "hex_bipyr",
-                                            "oct_max",
-                                            "sq_plan_max",
-                                            "hex_plan_max",
-                                        }:
-                                            if (
-                                                thetam < self._params[idx]["min_SPP"]
-                                                and thetak < self._params[idx]["min_SPP"]
-                                            ):
-                                                tmp = (
-                                                    math.cos(self._params[idx]["fac_AA"] * phi)
-                                                    ** self._params[idx]["exp_cos_AA"]
-                                                )
-                                                tmp2 = (
-                                                    self._params[idx]["IGW_EP"] * (thetam * ipi - 0.5)
-                                                    if typ != "hex_plan_max"
-                                                    else self._params[idx]["IGW_TA"]
-                                                    * (math.fabs(thetam * ipi - 0.5) - self._params[idx]["TA"])
-                                                )
-                                                qsp_theta[idx][j][kc] += tmp * math.exp(-0.5 * tmp2 * tmp2)
-                                                norms[idx][j][kc] += 1
-                                        elif typ == "bcc" and j < k:
-                                            if thetak < self._params[idx]["min_SPP"]:
-                                                fac = 1 if thetak > piover2 else -1
-                                                tmp = (thetam - piover2) / math.asin(1 / 3)
-                                                qsp_theta[idx][j][kc] += (
-                                                    fac * math.cos(3 * phi) * fac_bcc * tmp * math.exp(-0.5 * tmp * tmp)
-                                                )
-                                                norms[idx][j][kc] += 1
-                                        elif typ == "see_saw_rect":
-                                            if (
-                                                thetam < self._params[idx]["min_SPP"]
-                                                and thetak < self._params[idx]["min_SPP"]
-                                                and phi < 0.75 * math.pi
-                                            ):
-                                                tmp = (
-                                                    math.cos(self._params[idx]["fac_AA"] * phi)
-                                                    ** self._params[idx]["exp_cos_AA"]
-                                                )
-                                                tmp2 = self._params[idx]["IGW_EP"] * (thetam * ipi - 0.5)
-                                                qsp_theta[idx][j][kc] += tmp * math.exp(-0.5 * tmp2 * tmp2)
-                                                norms[idx][j][kc] += 1.0
-                                        elif typ in ["cuboct", "cuboct_max"]:
-                                            if (
-                                                thetam < self._params[idx]["min_SPP"]
-                                                and self._params[idx][4] < thetak < self._params[idx][2]
-                                            ):
-                                                if self._params[idx][4] < thetam < self._params[idx][2]:
-                                                    tmp = math.cos(phi)
-                                                    tmp2 = self._params[idx][5] * (thetam * ipi - 0.5)
-                                                    qsp_theta[idx][j][kc] += tmp * tmp * math.exp(-0.5 * tmp2 * tmp2)
-                                                    norms[idx][j][kc] += 1.0
-                                                elif thetam < self._params[idx][4]:
-                                                    tmp = 0.0556 * (math.cos(phi - 0.5 * math.pi) - 0.81649658)
-                                                    tmp2 = self._params[idx][6] * (thetam * ipi - onethird)
-                                                    qsp_theta[idx][j][kc] += math.exp(-0.5 * tmp * tmp) * math.exp(
-                                                        -0.5 * tmp2 * tmp2
-                                                    )
-                                                    norms[idx][j][kc] += 1.0
-                                                elif thetam > self._params[idx][2]:
-                                                    tmp = 0.0556 * (math.cos(phi - 0.5 * math.pi) - 0.81649658)
-                                                    tmp2 = self._params[idx][6] * (thetam * ipi - twothird)
-                                                    qsp_theta[idx][j][kc] += math.exp(-0.5 * tmp * tmp) * math.exp(
-                                                        -0.5 * tmp2 * tmp2
-                                                    )
-                                                    norms[idx][j][kc] += 1.0
-                                        elif (
-                                            typ == "sq_face_cap_trig_pris"
-                                            and not flag_yaxis
-                                            and thetak < self._params[idx]["TA3"]
-                                        ):
-                                            if thetam < self._params[idx]["TA3"]:
-                                                tmp = (
-                                                    math.cos(self._params[idx]["fac_AA1"] * phi2)
-                                                    ** self._params[idx]["exp_cos_AA1"]
-                                                )
-                                                tmp2 = self._params[idx]["IGW_TA1"] * (
-                                                    thetam * ipi - self._params[idx]["TA1"]
-                                                )
-                                            else:
-                                                tmp = (
-                                                    math.cos(
-                                                        self._params[idx]["fac_AA2"]
-                                                        * (phi2 + self._params[idx]["shift_AA2"])
-                                                    )
-                                                    ** self._params[idx]["exp_cos_AA2"]
-                                                )
-                                                tmp2 = self._params[idx]["IGW_TA2"] * (
-                                                    thetam * ipi - self._params[idx]["TA2"]
-                                                )
-
-                                            qsp_theta[idx][j][kc] += tmp * math.exp(-0.5 * tmp2 * tmp2)
-                                            norms[idx][j][kc] += 1
-
-                        kc += 1
+                # Polar angles of all neighbors with respect to neighbor j
+                thetas = np.arccos(np.clip(rij_norm @ zaxis, -1.0, 1.0))
+                if self._comp_phis:
+                    # Gram-Schmidt orthogonalization of all neighbors against
+                    # neighbor j, normalized wherever it does not vanish
+                    xaxes = rij_norm - np.outer(rij_norm @ zaxis / (zaxis @ zaxis), zaxis)
+                    xnorms = np.sqrt(np.einsum("ij,ij->i", xaxes, xaxes))
+                    flags_xaxis = xnorms < very_small
+                    xaxes /= np.where(flags_xaxis, 1.0, xnorms)[:, None]
+                    # Angles between the components of all pairs of neighbors
+                    # k and m orthogonal to neighbor j
+                    cos_phis = xaxes @ xaxes.T
+                    phis = np.arccos(np.clip(cos_phis, -1.0, 1.0))
+                else:
+                    flags_xaxis = np.zeros(n_neighbors, dtype=bool)
+                    phis = np.empty((n_neighbors, 0))
+                if self._comp_azi:
+                    yaxes = np.cross(zaxis, xaxes)
+                    ynorms = np.sqrt(np.einsum("ij,ij->i", yaxes, yaxes))
+                    flags_yaxis = ynorms <= very_small
+                    yaxes /= np.where(flags_yaxis, 1.0, ynorms)[:, None]
+                    phi2s = np.arctan2(yaxes @ xaxes.T, cos_phis)
+                else:
+                    flags_yaxis = np.zeros(n_neighbors, dtype=bool)
+                    phi2s = np.zeros_like(phis)
+                _accumulate_geomops(
+                    j,
+                    self._geomop_codes,
+                    self._geomop_params,
+                    qsp_theta[:, j],
+                    norms[:, j],
+                    cos_aa_settings=self._cos_aa_settings,
+                    cos_aa_indices=self._cos_aa_indices,
+                    thetas=thetas,
+                    flags_xaxis=flags_xaxis,
+                    phis=phis,
+                    phi2s=phi2s,
+                    flags_yaxis=flags_yaxis,
+                )
 
             # Normalize Peters-style OPs.
             for idx, typ in enumerate(self._types):
@@ -3248,11 +3783,8 @@ class LocalStructOrderParams:
                     "cuboct",
                     "pent_plan",
                 }:
-                    ops[idx] = tmp_norm = 0.0
-                    for j in range(n_neighbors):
-                        ops[idx] += sum(qsp_theta[idx][j])
-                        tmp_norm += float(sum(norms[idx][j]))
-                    ops[idx] = ops[idx] / tmp_norm if tmp_norm > 1.0e-12 else None  # type: ignore[operator]
+                    tmp_norm = float(norms[idx].sum())
+                    ops[idx] = float(qsp_theta[idx].sum()) / tmp_norm if tmp_norm > 1.0e-12 else None
 
                 elif typ in {
                     "T",
@@ -3276,17 +3808,13 @@ class LocalStructOrderParams:
                 }:
                     ops[idx] = None  # type: ignore[call-overload]
                     if n_neighbors > 1:
-                        for j in range(n_neighbors):
-                            for k in range(len(qsp_theta[idx][j])):
-                                qsp_theta[idx][j][k] = (
-                                    qsp_theta[idx][j][k] / norms[idx][j][k] if norms[idx][j][k] > 1.0e-12 else 0.0
-                                )
-                            ops[idx] = max(qsp_theta[idx][j]) if j == 0 else max(ops[idx], *qsp_theta[idx][j])
+                        normed = norms[idx] > 1.0e-12
+                        ops[idx] = float(
+                            np.divide(qsp_theta[idx], norms[idx], out=np.zeros_like(qsp_theta[idx]), where=normed).max()
+                        )
 
                 elif typ == "bcc":
-                    ops[idx] = 0.0
-                    for j in range(n_neighbors):
-                        ops[idx] += sum(qsp_theta[idx][j])
+                    ops[idx] = float(qsp_theta[idx].sum())
                     if n_neighbors > 3:
                         ops[idx] = ops[idx] / float(  # type: ignore[operator]
                             0.5 * float(n_neighbors * (6 + (n_neighbors - 2) * (n_neighbors - 3)))
@@ -3301,9 +3829,7 @@ class LocalStructOrderParams:
                         for d in dist:
                             tmp = self._params[idx][2] * (d - dmean)
                             acc = acc + math.exp(-0.5 * tmp * tmp)
-                        for j in range(n_neighbors):
-                            ops[idx] = max(qsp_theta[idx][j]) if j == 0 else max(ops[idx], *qsp_theta[idx][j])
-                        ops[idx] = acc * ops[idx] / float(n_neighbors)  # type: ignore[operator]
+                        ops[idx] = acc * float(qsp_theta[idx].max()) / float(n_neighbors)
                         # nneigh * (nneigh - 1))
                     else:
                         ops[idx] = None  # type: ignore[call-overload]
@@ -3312,19 +3838,12 @@ class LocalStructOrderParams:
         # neighbors.
         if self._geomops2:
             # Compute all (unique) angles and sort the resulting list.
-            aij = []
-            for ir, r in enumerate(rij_norm, start=1):
-                for j in range(ir, len(rij_norm)):
-                    aij.append(math.acos(max(-1.0, min(np.inner(r, rij_norm[j]), 1.0))))
-            aijs = sorted(aij)
+            aij = np.arccos(np.clip(rij_norm @ rij_norm.T, -1.0, 1.0))[np.triu_indices(n_neighbors, k=1)]
+            aijs = np.sort(aij).tolist()
 
             # Compute height, side and diagonal length estimates.
-            neighscent = np.array([0.0, 0.0, 0.0])
-            for neigh in neighsites:
-                neighscent = neighscent + neigh.coords
-            if n_neighbors > 0:
-                neighscent = neighscent / float(n_neighbors)
-            h = np.linalg.norm(neighscent - centvec)
+            neighscent = neighcoords.mean(axis=0) if n_neighbors > 0 else np.zeros(3)
+            h = math.dist(neighscent, centvec)
             b = min(distjk_unique) if len(distjk_unique) > 0 else 0
             dhalf = max(distjk_unique) / 2 if len(distjk_unique) > 0 else 0
 
@@ -3347,6 +3866,107 @@ class LocalStructOrderParams:
 
         return ops
 
+    def get_order_parameters_batch(
+        self, structure: Structure, indices: list[int] | None = None, target_spec=None
+    ) -> np.ndarray:
+        """
+        Compute all order parameters of many sites at once.
+
+        The neighbors of all sites are gathered from a single neighbor list
+        of the structure, and the order parameters "cn", "sgl_bd", "q2",
+        "q4" and "q6" are then evaluated for all sites together. Other
+        order parameters, Voronoi-based neighbor finding and non-periodic
+        inputs are handled site by site with get_order_parameters.
+
+        Args:
+            structure (Structure): input structure.
+            indices (list[int]): indices of the sites for which OPs are to
+                be calculated. None (default) includes all sites.
+            target_spec (Species): target species to be considered
+                when calculating the order parameters; None includes
+                all species of input structure.
+
+        Returns:
+            numpy array: order parameters of shape (number of sites,
+            number of OPs). OPs that cannot be computed for a site (None
+            in get_order_parameters) are NaN.
+        """
+        if indices is None:
+            indices = list(range(len(structure)))
+        for index in indices:
+            if index < 0:
+                raise ValueError("Site index smaller zero!")
+            if index >= len(structure):
+                raise ValueError("Site index beyond maximum!")
+        if len(indices) == 0:
+            return np.empty((0, self.num_ops))
+
+        if (
+            self._voroneigh
+            or not isinstance(structure, (Structure, IStructure))
+            or not self.__batch_types.issuperset(self._types)
+        ):
+            return np.array(
+                [
+                    [
+                        np.nan if op is None else op
+                        for op in self.get_order_parameters(structure, n, target_spec=target_spec)
+                    ]
+                    for n in indices
+                ],
+                dtype=float,
+            ).reshape(len(indices), self.num_ops)
+
+        site_indices = np.array(indices, dtype=int)
+        center_indices, points_indices, images, distances = structure.get_neighbor_list(
+            self._cutoff, sites=[structure[n] for n in site_indices], exclude_self=False
+        )
+        # Only the central site itself is excluded from its neighbors
+        mask = (points_indices != site_indices[center_indices]) | np.any(images != 0, axis=1)
+        if target_spec is not None:
+            # Only look up the species of actual neighbors, as disordered sites have no single specie
+            neigh_indices, inverse = np.unique(points_indices[mask], return_inverse=True)
+            is_target = np.array([structure[idx].specie.symbol == target_spec for idx in neigh_indices], dtype=bool)
+            mask[mask] = is_target[inverse]
+        center_indices, points_indices = center_indices[mask], points_indices[mask]
+        images, distances = images[mask], distances[mask]
+
+        # Pad the bond vectors of all sites to the largest number of
+        # neighbors, the number of neighbors of each site acting as mask
+        n_neighbors = np.bincount(center_indices, minlength=len(site_indices))
+        n_max = int(n_neighbors.max())
+        order = np.argsort(center_indices, kind="stable")
+        center_indices, points_indices = center_indices[order], points_indices[order]
+        images, distances = images[order], distances[order]
+        slots = np.arange(len(center_indices)) - (np.cumsum(n_neighbors) - n_neighbors)[center_indices]
+
+        neighcoords = structure.lattice.get_cartesian_coords(structure.frac_coords[points_indices] + images)
+        rij = neighcoords - structure.cart_coords[site_indices][center_indices]
+        rij_norm = np.zeros((len(site_indices), n_max, 3))
+        rij_norm[center_indices, slots] = rij / distances[:, None]
+        dist = np.full((len(site_indices), max(n_max, 2)), np.inf)
+        dist[center_indices, slots] = distances
+
+        ops = np.zeros((len(site_indices), self.num_ops))
+        for idx, typ in enumerate(self._types):
+            if typ == "cn":
+                ops[:, idx] = n_neighbors / self._params[idx]["norm"]
+            elif typ == "sgl_bd":
+                dist_sorted = np.sort(dist, axis=1)
+                ops[n_neighbors == 1, idx] = 1
+                many = n_neighbors > 1
+                ops[many, idx] = 1 - dist_sorted[many, 0] / dist_sorted[many, 1]
+            else:
+                ops[:, idx] = _get_boops(
+                    np.ascontiguousarray(rij_norm[:, :, 0]),
+                    np.ascontiguousarray(rij_norm[:, :, 1]),
+                    np.ascontiguousarray(rij_norm[:, :, 2]),
+                    n_neighbors,
+                    int(typ[1]),
+                )
+
+        return ops
+
 
 class BrunnerNNReciprocal(NearNeighbors):
     """
@@ -3397,11 +4017,11 @@ class BrunnerNNReciprocal(NearNeighbors):
         """
         site = structure[n]
         neighs_dists = structure.get_neighbors(site, self.cutoff)
-        ds = sorted(idx.nn_distance for idx in neighs_dists)
+        ds = np.sort([nn.nn_distance for nn in neighs_dists])
 
-        ns = [1 / ds[idx] - 1 / ds[idx + 1] for idx in range(len(ds) - 1)]
+        ns = 1 / ds[:-1] - 1 / ds[1:]
 
-        d_max = ds[ns.index(max(ns))]
+        d_max = ds[np.argmax(ns)]
         siw = []
         for nn in neighs_dists:
             site, dist = nn, nn.nn_distance
@@ -3473,11 +4093,11 @@ class BrunnerNNRelative(NearNeighbors):
         """
         site = structure[n]
         neighs_dists = structure.get_neighbors(site, self.cutoff)
-        ds = sorted(idx.nn_distance for idx in neighs_dists)
+        ds = np.sort([nn.nn_distance for nn in neighs_dists])
 
-        ns = [ds[idx + 1] / ds[idx] for idx in range(len(ds) - 1)]
+        ns = ds[1:] / ds[:-1]
 
-        d_max = ds[ns.index(max(ns))]
+        d_max = ds[np.argmax(ns)]
         siw = []
         for nn in neighs_dists:
             s, dist = nn, nn.nn_distance
@@ -3549,11 +4169,11 @@ class BrunnerNNReal(NearNeighbors):
         """
         site = structure[n]
         neighs_dists = structure.get_neighbors(site, self.cutoff)
-        ds = sorted(idx.nn_distance for idx in neighs_dists)
+        ds = np.sort([nn.nn_distance for nn in neighs_dists])
 
-        ns = [ds[idx + 1] - ds[idx] for idx in range(len(ds) - 1)]
+        ns = np.diff(ds)
 
-        d_max = ds[ns.index(max(ns))]
+        d_max = ds[np.argmax(ns)]
         siw = []
         for nn in neighs_dists:
             s, dist = nn, nn.nn_distance
@@ -3660,20 +4280,13 @@ class EconNN(NearNeighbors):
 
         if self.use_fictive_radius:
             # calculate fictive ionic radii
-            firs = [_get_fictive_ionic_radius(site, neighbor) for neighbor in neighbors]
+            firs = np.array([_get_fictive_ionic_radius(site, neighbor) for neighbor in neighbors], dtype=float)
         else:
             # just use the bond distance
-            firs = [neighbor.nn_distance for neighbor in neighbors]
+            firs = np.array([neighbor.nn_distance for neighbor in neighbors], dtype=float)
 
         # calculate mean fictive ionic radius
-        mefir = _get_mean_fictive_ionic_radius(firs)
-
-        # # iteratively solve MEFIR; follows equation 4 in Hoppe's EconN paper
-        prev_mefir = float("inf")
-        while abs(prev_mefir - mefir) > 1e-4:
-            # this is guaranteed to converge
-            prev_mefir = mefir
-            mefir = _get_mean_fictive_ionic_radius(firs, minimum_fir=mefir)
+        mefir = _get_converged_mean_fictive_ionic_radius(firs)
 
         siw = []
         for nn, fir in zip(neighbors, firs):
@@ -3717,10 +4330,8 @@ def _get_fictive_ionic_radius(site: Site, neighbor: PeriodicNeighbor) -> float:
     return neighbor.nn_distance * (r_h / (r_h + r_i))
 
 
-def _get_mean_fictive_ionic_radius(
-    fictive_ionic_radii: list[float],
-    minimum_fir: float | None = None,
-) -> float:
+@njit
+def _get_mean_fictive_ionic_radius(fictive_ionic_radii: np.ndarray, minimum_fir: float) -> float:
     """Get the mean fictive ionic radius.
 
     Follows equation 2:
@@ -3730,23 +4341,46 @@ def _get_mean_fictive_ionic_radius(
     150.1-4 (1979): 23-52.
 
     Args:
-        fictive_ionic_radii: List of fictive ionic radii for a center site
+        fictive_ionic_radii: Array of fictive ionic radii for a center site
             and its neighbors.
         minimum_fir: Minimum fictive ionic radius to use.
 
     Returns:
         Hoppe's mean fictive ionic radius.
     """
-    if not minimum_fir:
-        minimum_fir = min(fictive_ionic_radii)
+    # (fir / minimum_fir) ** 6 as a square cubed, which numpy does not special-case
+    ratios = fictive_ionic_radii / minimum_fir
+    ratios *= ratios
+    weights = np.exp(1 - ratios * ratios * ratios)
+
+    return (fictive_ionic_radii * weights).sum() / weights.sum()
+
+
+@njit
+def _get_converged_mean_fictive_ionic_radius(fictive_ionic_radii: np.ndarray) -> float:
+    """Iteratively solve for the mean fictive ionic radius.
+
+    Follows equation 4 of:
+
+    Hoppe, Rudolf. "Effective coordination numbers (ECoN) and mean fictive ionic
+    radii (MEFIR)." Zeitschrift für Kristallographie-Crystalline Materials
+    150.1-4 (1979): 23-52.
+
+    Args:
+        fictive_ionic_radii: Array of fictive ionic radii for a center site
+            and its neighbors.
 
-    weighted_sum = 0.0
-    total_sum = 0.0
-    for fir in fictive_ionic_radii:
-        weighted_sum += fir * math.exp(1 - (fir / minimum_fir) ** 6)
-        total_sum += math.exp(1 - (fir / minimum_fir) ** 6)
+    Returns:
+        Hoppe's mean fictive ionic radius.
+    """
+    mefir = _get_mean_fictive_ionic_radius(fictive_ionic_radii, fictive_ionic_radii.min())
+    prev_mefir = math.inf
+    while abs(prev_mefir - mefir) > 1e-4:
+        # this is guaranteed to converge
+        prev_mefir = mefir
+        mefir = _get_mean_fictive_ionic_radius(fictive_ionic_radii, mefir)
 
-    return weighted_sum / total_sum
+    return mefir
 
 
 class CrystalNN(NearNeighbors):
@@ -3854,14 +4488,14 @@ class CrystalNN(NearNeighbors):
                 entry["weight"] = 1
             return nn
 
-        for entry in nn_data.all_nninfo:
-            weight = 0
-            for cn in nn_data.cn_nninfo:
-                for cn_entry in nn_data.cn_nninfo[cn]:
-                    if entry["site"] == cn_entry["site"]:
-                        weight += nn_data.cn_weights[cn]
+        # entries of cn_nninfo are those of all_nninfo, so sites can be matched by identity
+        weights: dict[int, float] = defaultdict(float)
+        for cn, cn_nninfo in nn_data.cn_nninfo.items():
+            for cn_entry in cn_nninfo:
+                weights[id(cn_entry["site"])] += nn_data.cn_weights[cn]
 
-            entry["weight"] = weight
+        for entry in nn_data.all_nninfo:
+            entry["weight"] = weights[id(entry["site"])]
 
         return nn_data.all_nninfo
 
@@ -3897,7 +4531,7 @@ class CrystalNN(NearNeighbors):
         # get base VoronoiNN targets
         cutoff = self.search_cutoff
         vnn = VoronoiNN(weight="solid_angle", targets=target, cutoff=cutoff)
-        nn = vnn.get_nn_info(structure, n)
+        nn = nn_voronoi = vnn.get_nn_info(structure, n)
 
         # solid angle weights can be misleading in open / porous structures
         # adjust weights to correct for this behavior
@@ -3907,8 +4541,8 @@ class CrystalNN(NearNeighbors):
 
         # adjust solid angle weight based on electronegativity difference
         if self.x_diff_weight > 0:
+            X1 = structure[n].specie.X
             for entry in nn:
-                X1 = structure[n].specie.X
                 X2 = entry["site"].specie.X
 
                 if math.isnan(X1) or math.isnan(X2):
@@ -3932,8 +4566,15 @@ class CrystalNN(NearNeighbors):
         # adjust solid angle weights based on distance
         if self.distance_cutoffs:
             r1 = _get_radius(structure[n])
-            for entry in nn:
-                r2 = _get_radius(entry["site"])
+            # radii only depend on the species, which neighbors tend to share
+            radii: dict[SpeciesLike, float] = {}
+            rel_coords = np.array([entry["site"].coords for entry in nn]) - structure[n].coords
+            dists = np.sqrt(np.einsum("ij,ij->i", rel_coords, rel_coords))
+            for entry, dist in zip(nn, dists):
+                specie = entry["site"].specie
+                if specie not in radii:
+                    radii[specie] = _get_radius(entry["site"])
+                r2 = radii[specie]
                 if r1 > 0 and r2 > 0:
                     diameter = r1 + r2
                 else:
@@ -3944,7 +4585,6 @@ class CrystalNN(NearNeighbors):
                     )
                     diameter = _get_default_radius(structure[n]) + _get_default_radius(entry["site"])
 
-                dist = np.linalg.norm(structure[n].coords - entry["site"].coords)
                 dist_weight: float = 0
 
                 cutoff_low = diameter + self.distance_cutoffs[0]
@@ -3965,8 +4605,10 @@ class CrystalNN(NearNeighbors):
             entry["weight"] = round(entry["weight"], 3)
             del entry["poly_info"]  # trim
 
-        # remove entries with no weight
-        nn = [x for x in nn if x["weight"] > 0]
+        # remove entries with no weight and sort by the rounded weights, neighbors of
+        # equal weight keeping the order of VoronoiNN rather than that set by the
+        # floating-point noise of the unrounded weights
+        nn = sorted((x for x in nn_voronoi if x["weight"] > 0), key=lambda x: x["weight"], reverse=True)
 
         # get the transition distances, i.e. all distinct weights
         dist_bins: list[float] = []
@@ -4240,14 +4882,18 @@ class CutOffDictNN(NearNeighbors):
                 represents a coordinated site, its image location, and its weight.
         """
         site = structure[n]
+        # cut-off distances to all species listed for this one
+        cut_off_dists = self._lookup_dict.get(site.species_string, {})
+        if not cut_off_dists:
+            return []
 
-        neighs_dists = structure.get_neighbors(site, self._max_dist)
+        neighs_dists = structure.get_neighbors(site, max(cut_off_dists.values()))
 
         nn_info = []
         for nn in neighs_dists:
             n_site = nn
             dist = nn.nn_distance
-            neigh_cut_off_dist = self._lookup_dict.get(site.species_string, {}).get(n_site.species_string, 0.0)
+            neigh_cut_off_dist = cut_off_dists.get(n_site.species_string, 0.0)
 
             if dist < neigh_cut_off_dist:
                 nn_info.append(
@@ -6,6 +6,7 @@ from typing import get_args
 
 import numpy as np
 import pytest
+from joblib import parallel_config
 from numpy.testing import assert_allclose
 from pymatgen.analysis.graphs import MoleculeGraph, StructureGraph
 from pymatgen.analysis.local_env import (
@@ -81,6 +82,16 @@ class TestVoronoiNN(PymatgenTest):
     def test_get_voronoi_polyhedra(self):
         assert len(self.nn.get_voronoi_polyhedra(self.struct, 0).items()) == 8
 
+    def test_prune_tessellation(self):
+        pruned_nn = VoronoiNN(targets=[Element("O")], prune_tessellation=True)
+        for idx in range(len(self.struct)):
+            full = self.nn.get_voronoi_polyhedra(self.struct, idx)
+            pruned = pruned_nn.get_voronoi_polyhedra(self.struct, idx)
+            assert set(pruned) == set(full)
+            for key, face in full.items():
+                assert pruned[key]["solid_angle"] == approx(face["solid_angle"])
+                assert pruned[key]["volume"] == approx(face["volume"])
+
     def test_get_cn(self):
         site_0_coord_num = self.nn.get_cn(self.struct, 0, use_weights=True, on_disorder="take_max_species")
         assert site_0_coord_num == approx(5.809265748999465, abs=1e-7)
@@ -270,6 +281,17 @@ class TestJmolNN(PymatgenTest):
         # Verify get_nn function works
         assert len(self.jmol_update.get_nn(struct, 0)) == 2
 
+    def test_all_at_once(self):
+        struct = self.get_structure("LiFePO4")
+
+        all_nn_info = self.jmol.get_all_nn_info(struct)
+        assert len(all_nn_info) == len(struct)
+        for idx, info in enumerate(all_nn_info):
+            by_one = self.jmol.get_nn_info(struct, idx)
+            assert sorted((x["site_index"], x["image"], x["weight"]) for x in info) == sorted(
+                (x["site_index"], x["image"], x["weight"]) for x in by_one
+            )
+
 
 class TestIsayevNN(PymatgenTest):
     def test_get_nn(self):
@@ -352,6 +374,24 @@ class TestCovalentBondNN(PymatgenTest):
         acetylene = strategy.get_bonded_structure(self.acetylene)
         assert len(acetylene.graph.nodes) == 4
 
+    def test_nn_shell(self):
+        strategy = CovalentBondNN()
+
+        # The second shell of a carbon in acetylene is the hydrogen of the other carbon
+        shell = strategy.get_nn_shell_info(self.acetylene, 0, 2)
+        assert len(shell) == 1
+        assert shell[0]["site"].species_string == "H"
+        assert shell[0]["weight"] == approx(3)
+
+    def test_all_at_once(self):
+        strategy = CovalentBondNN()
+
+        all_nn_info = strategy.get_all_nn_info(self.benzene)
+        assert len(all_nn_info) == len(self.benzene)
+        for idx, info in enumerate(all_nn_info):
+            by_one = strategy.get_nn_info(self.benzene, idx)
+            assert [(x["site_index"], x["weight"]) for x in info] == [(x["site_index"], x["weight"]) for x in by_one]
+
 
 class TestMiniDistNN(PymatgenTest):
     def setUp(self):
@@ -450,6 +490,29 @@ class TestMiniDistNN(PymatgenTest):
         assert crystal_nn.get_cn(self.cscl, 0) == 8
         assert crystal_nn.get_cn(self.lifepo4, 0) == 6
 
+    def test_all_at_once(self):
+        for nn in (
+            MinimumDistanceNN(),
+            MinimumDistanceNN(cutoff=5, get_all_sites=True),
+            MinimumOKeeffeNN(),
+            MinimumVIRENN(),
+        ):
+            for struct in (self.cscl, self.mos2, self.lifepo4):
+                all_nn_info = nn.get_all_nn_info(struct)
+                assert len(all_nn_info) == len(struct)
+                for idx, info in enumerate(all_nn_info):
+                    by_one = nn.get_nn_info(struct, idx)
+                    assert sorted((x["site_index"], x["image"], x["weight"]) for x in info) == sorted(
+                        (x["site_index"], x["image"], x["weight"]) for x in by_one
+                    )
+
+    def test_min_vire_site_order(self):
+        # The cached radii must not be reused for the same sites in another order
+        min_vire_nn = MinimumVIRENN(tol=0.01)
+        reordered = Structure.from_sites(self.cscl[::-1])
+        assert {x["site"].species_string for x in min_vire_nn.get_nn_info(self.cscl, 0)} == {"Cs+"}
+        assert {x["site"].species_string for x in min_vire_nn.get_nn_info(reordered, 0)} == {"Cl-"}
+
     def test_get_local_order_params(self):
         min_dist_nn = MinimumDistanceNN()
         ops = min_dist_nn.get_local_order_parameters(self.diamond, 0)
@@ -458,6 +521,17 @@ class TestMiniDistNN(PymatgenTest):
         ops = min_dist_nn.get_local_order_parameters(self.nacl, 0)
         assert ops["octahedral"] == approx(0.9999995266669)
 
+    def test_decorate_n_jobs(self):
+        min_dist_nn = MinimumDistanceNN()
+        serial = min_dist_nn.get_bonded_structure(self.diamond, decorate=True)
+        # The threading backend exercises the parallel dispatch without spawning worker processes
+        with parallel_config(backend="threading"):
+            parallel = min_dist_nn.get_bonded_structure(self.diamond, decorate=True, n_jobs=2)
+        assert (
+            parallel.structure.site_properties["order_parameters"]
+            == serial.structure.site_properties["order_parameters"]
+        )
+
 
 class TestMotifIdentification(PymatgenTest):
     def setUp(self):
@@ -963,6 +1037,15 @@ class TestLocalStructOrderParams(PymatgenTest):
         parameters[0]["norm"] = 3
         assert tmp == lostops.get_parameters(0)
 
+        assert lostops.last_nneigh == -1
+        lostops.get_order_parameters(self.bcc, 0, indices_neighs=[1])
+        assert lostops.last_nneigh == 1
+
+        parameters = [LocalStructOrderParams(["tet"]).get_parameters(0)]
+        del parameters[0]["fac_AA"]
+        with pytest.raises(ValueError, match=r"Missing parameter 'fac_AA' for order parameter type \(tet\)!"):
+            LocalStructOrderParams(["tet"], parameters=parameters)
+
     def test_get_order_parameters(self):
         # Set up everything.
         op_types = [
@@ -1029,6 +1112,8 @@ class TestLocalStructOrderParams(PymatgenTest):
         # 45 degrees-bent motif.
         op_vals = ops_101.get_order_parameters(self.bent45, 0)
         assert op_vals[2] == approx(1)
+        ops_bent = LocalStructOrderParams(["bent"], parameters=[op_params[2]], cutoff=1.01)
+        assert ops_bent.get_order_parameters(self.bent45, 0) == [op_vals[2]]
 
         # T-shape motif.
         op_vals = ops_101.get_order_parameters(self.T_shape, 0, indices_neighs=[1, 2, 3])
@@ -1149,6 +1234,43 @@ class TestLocalStructOrderParams(PymatgenTest):
         with pytest.raises(ValueError, match="Neighbor site index beyond maximum!"):
             ops_101.get_order_parameters(self.bcc, 0, indices_neighs=[2])
 
+    def test_get_order_parameters_batch(self):
+        op_types = ["cn", "sgl_bd", "q2", "q4", "q6"]
+        ops = LocalStructOrderParams(op_types, cutoff=0.75)
+        for struct in (self.fcc, self.diamond):
+            op_vals = ops.get_order_parameters_batch(struct)
+            assert op_vals.shape == (len(struct), len(op_types))
+            for n in range(len(struct)):
+                assert_allclose(op_vals[n], ops.get_order_parameters(struct, n), atol=1e-12)
+        assert_allclose(
+            ops.get_order_parameters_batch(self.diamond, [1]),
+            ops.get_order_parameters_batch(self.diamond)[[1]],
+            atol=1e-12,
+        )
+
+        # Only the species of neighbors are looked up for target_spec, so a
+        # disordered site out of reach of all sites does not matter.
+        struct = Structure(
+            Lattice.cubic(10), ["Cu", "Cu", {"Sr": 0.5, "Ba": 0.5}], [[0, 0, 0], [0.25, 0, 0], [0.6, 0.6, 0.6]]
+        )
+        ops_cu = LocalStructOrderParams(op_types, cutoff=3)
+        assert_allclose(
+            ops_cu.get_order_parameters_batch(struct, [0, 1], target_spec="Cu"),
+            [ops_cu.get_order_parameters(struct, n, target_spec="Cu") for n in (0, 1)],
+            atol=1e-12,
+        )
+
+        # Sites without neighbors give NaN for the BOOPs.
+        op_vals = LocalStructOrderParams(op_types, cutoff=0.5).get_order_parameters_batch(self.fcc)
+        assert_allclose(op_vals[:, :2], 0)
+        assert np.isnan(op_vals[:, 2:]).all()
+
+        # Other OPs are computed site by site.
+        ops = LocalStructOrderParams(["cn", "oct"], cutoff=0.75)
+        assert_allclose(ops.get_order_parameters_batch(self.fcc, [0]), [ops.get_order_parameters(self.fcc, 0)])
+        with pytest.raises(ValueError, match="Site index beyond maximum!"):
+            ops.get_order_parameters_batch(self.fcc, [len(self.fcc)])
+
 
 class TestCrystalNN(PymatgenTest):
     def setUp(self):
@@ -1250,6 +1372,28 @@ class TestCrystalNN(PymatgenTest):
 
         assert len(bonded_struct.get_connected_sites(0)) == len(bonded_struct_shifted.get_connected_sites(0))
 
+    def test_equal_weight_order(self):
+        # Neighbors of equal weight keep the order of VoronoiNN
+        struct = Structure(Lattice.cubic(4.2), ["Cs", "Cl"], [[0, 0, 0], [0.5, 0.5, 0.5]])
+        nn_info = CrystalNN(weighted_cn=True).get_nn_info(struct, 0)
+        assert [(entry["site_index"], tuple(entry["image"])) for entry in nn_info] == [
+            (1, (0, 0, -1)),
+            (1, (0, 0, 0)),
+            (1, (-1, 0, -1)),
+            (1, (0, -1, -1)),
+            (1, (0, -1, 0)),
+            (1, (-1, 0, 0)),
+            (1, (-1, -1, -1)),
+            (1, (-1, -1, 0)),
+            (0, (0, 1, 0)),
+            (0, (0, 0, -1)),
+            (0, (1, 0, 0)),
+            (0, (0, 0, 1)),
+            (0, (-1, 0, 0)),
+            (0, (0, -1, 0)),
+        ]
+        assert [entry["weight"] for entry in nn_info] == approx([1] * 8 + [0.1208] * 6, abs=1e-4)
+
     def test_get_cn(self):
         cnn = CrystalNN()
 